@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Hospital, HospitalStaff
+from .models import User, Hospital, HospitalStaff, RevokedToken
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -13,10 +13,16 @@ class CustomUserAdmin(UserAdmin):
 @admin.register(Hospital)
 class HospitalAdmin(admin.ModelAdmin):
     list_display = ('name', 'username', 'city', 'state', 'is_active')
-    list_filter = ('city', 'state', 'is_active')
+    list_filter = ('state_ref', 'city_ref', 'is_active')
     search_fields = ('name', 'username', 'license_number')
 
 @admin.register(HospitalStaff)
 class HospitalStaffAdmin(admin.ModelAdmin):
     list_display = ('user', 'hospital', 'designation', 'is_primary_contact')
-    list_filter = ('hospital', 'designation')
\ No newline at end of file
+    list_filter = ('hospital', 'designation')
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'token_type', 'user', 'revoked_at', 'expires_at')
+    list_filter = ('token_type',)
+    search_fields = ('jti', 'user__username')
@@ -0,0 +1,105 @@
+"""
+JWT authentication with a cached user context.
+
+``CachedJWTAuthentication`` resolves the token's user once, together with
+its HospitalStaff row and hospital (one query with select_related), and
+keeps the result in the cache for ``AUTH_CONTEXT_CACHE_TIMEOUT`` seconds.
+The entry is dropped whenever the user, their staff record or their
+hospital is saved or deleted (see accounts/signals.py), so a changed role,
+deactivation or password change takes effect straight away. The password
+hash is left out of the cached copy; code that reads ``user.password``
+loads it from the database.
+
+Views get the hospital through ``get_hospital_staff(request.user)``, which
+reads the preloaded relation instead of querying again.
+
+Revoked tokens (see accounts/revocation.py) and tokens issued before the
+user's last "revoke all" are rejected.
+"""
+import copy
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .models import User, HospitalStaff
+from .revocation import is_revoked, issued_before_cutoff
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_CONTEXT_CACHE_ALIAS', 'default')]
+
+
+def context_key(user_id):
+    return f"auth:context:{user_id}"
+
+
+def invalidate_user_context(*user_ids):
+    """Forget cached contexts now and again once the current transaction commits"""
+    keys = [context_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    _cache().delete_many(keys)
+    transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def get_hospital_staff(user):
+    """
+    ``user``'s HospitalStaff with its hospital loaded. Uses the relation
+    preloaded by CachedJWTAuthentication when present; raises
+    HospitalStaff.DoesNotExist for users without a staff record.
+    """
+    if User.hospitalstaff.is_cached(user):
+        return user.hospitalstaff
+    return HospitalStaff.objects.select_related('hospital').get(user=user)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        key = context_key(user_id)
+        context = _cache().get(key)
+        if context is not None:
+            user, password_md5 = context
+        else:
+            try:
+                user = self.user_model.objects.select_related('hospitalstaff__hospital').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            password_md5 = get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None
+            # Keep the password hash out of the shared cache; on the cached
+            # copy it becomes a deferred field
+            cached_user = copy.copy(user)
+            del cached_user.password
+            staff = User.hospitalstaff.related.get_cached_value(user, default=None)
+            if staff is not None:
+                # The staff row links back to the user; point it at the copy
+                staff = copy.copy(staff)
+                HospitalStaff.user.field.set_cached_value(staff, cached_user)
+                User.hospitalstaff.related.set_cached_value(cached_user, staff)
+            _cache().set(key, (cached_user, password_md5), getattr(settings, 'AUTH_CONTEXT_CACHE_TIMEOUT', 60))
+
+        # Same checks as JWTAuthentication.get_user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_md5:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        if issued_before_cutoff(validated_token, user):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user
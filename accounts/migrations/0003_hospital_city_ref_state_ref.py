@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_revokedtoken_user_tokens_valid_after'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hospital',
+            name='city_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hospitals', to='locations.city'),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='state_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hospitals', to='locations.state'),
+        ),
+    ]
@@ -13,6 +13,8 @@ class User(AbstractUser):
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Tokens issued at or before this moment are rejected ("log out everywhere")
+    tokens_valid_after = models.DateTimeField(null=True, blank=True)
 
 class Hospital(models.Model):
     name = models.CharField(max_length=200)
@@ -23,6 +25,11 @@ class Hospital(models.Model):
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
+    # Normalized city/state, kept in step with the text fields (see locations/matching.py)
+    city_ref = models.ForeignKey('locations.City', on_delete=models.SET_NULL, null=True, blank=True,
+                                 editable=False, related_name='hospitals')
+    state_ref = models.ForeignKey('locations.State', on_delete=models.SET_NULL, null=True, blank=True,
+                                  editable=False, related_name='hospitals')
     license_number = models.CharField(max_length=100, unique=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -38,4 +45,21 @@ class HospitalStaff(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.user.username} - {self.hospital.name}"
\ No newline at end of file
+        return f"{self.user.username} - {self.hospital.name}"
+
+
+class RevokedToken(models.Model):
+    """A JWT (by jti) that must no longer be accepted, kept until it expires"""
+    TOKEN_TYPE_CHOICES = (
+        ('access', 'Access'),
+        ('refresh', 'Refresh'),
+    )
+    
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=10, choices=TOKEN_TYPE_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.token_type} {self.jti}"
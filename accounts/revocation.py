@@ -0,0 +1,136 @@
+"""
+Token revocation.
+
+Revoked token ids (jti) live in the ``RevokedToken`` table until the token
+would have expired anyway. Each process mirrors the table in a Bloom filter
+so the check on every authenticated request is a few hashes in memory:
+
+- "not in the filter" is definite, so almost every request stops there;
+- "maybe in the filter" is confirmed against the table (false positives
+  run at ``TOKEN_REVOCATION_ERROR_RATE``).
+
+The filter picks up rows revoked by other processes every
+``TOKEN_REVOCATION_SYNC_SECONDS``; tokens revoked in this process are
+added immediately. Each sync re-reads rows revoked up to
+``TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS`` before the previous one started:
+``revoked_at`` is stamped before the row commits, so a revocation can
+become visible after a newer one has already been read.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(int(capacity), 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_from = None
+        self._synced_at = 0.0
+
+    def _rebuild(self):
+        started = timezone.now()
+        active = RevokedToken.objects.filter(expires_at__gt=started)
+        capacity = max(getattr(settings, 'TOKEN_REVOCATION_CAPACITY', 100000), active.count() * 2)
+        bloom = BloomFilter(capacity, getattr(settings, 'TOKEN_REVOCATION_ERROR_RATE', 0.001))
+        for jti in active.values_list('jti', flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        self._bloom = bloom
+        # Rows committed while iterating are picked up by the next sync
+        self._synced_from = started
+
+    def _catch_up(self):
+        started = timezone.now()
+        overlap = timedelta(seconds=getattr(settings, 'TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS', 60))
+        recent = RevokedToken.objects.filter(revoked_at__gt=self._synced_from - overlap)
+        for jti in recent.values_list('jti', flat=True):
+            # Rows in the overlap were usually seen already; don't count them twice
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+        self._synced_from = started
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and self._bloom is not None and \
+                now - self._synced_at < getattr(settings, 'TOKEN_REVOCATION_SYNC_SECONDS', 5):
+            return
+        with self._lock:
+            if self._bloom is None or self._bloom.count >= self._bloom.capacity:
+                # First use, or the filter is full and its error rate is climbing
+                self._rebuild()
+            else:
+                self._catch_up()
+            self._synced_at = now
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self._bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+
+revocation_filter = RevocationFilter()
+
+
+def revoke(token, user=None):
+    """Revoke a validated simplejwt token (access or refresh)"""
+    jti = token.get(api_settings.JTI_CLAIM)
+    if not jti:
+        return
+    RevokedToken.objects.get_or_create(jti=jti, defaults={
+        'token_type': token.get(api_settings.TOKEN_TYPE_CLAIM, 'access'),
+        'user': user,
+        'expires_at': datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+    })
+    revocation_filter.add(jti)
+
+
+def is_revoked(token):
+    jti = token.get(api_settings.JTI_CLAIM)
+    return bool(jti) and revocation_filter.is_revoked(jti)
+
+
+def issued_before_cutoff(token, user):
+    """
+    True for tokens issued before the user's last "revoke all". ``iat`` is
+    in whole seconds, so tokens from the second of the cutoff itself still
+    pass; otherwise the login that follows a "revoke all" would fail too.
+    """
+    cutoff = getattr(user, 'tokens_valid_after', None)
+    issued_at = token.get('iat')
+    return cutoff is not None and issued_at is not None and issued_at < int(cutoff.timestamp())
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from blood_donation.cache import bump_version
+from .authentication import invalidate_user_context
+from .models import User, Hospital, HospitalStaff
+
+
+@receiver([post_save, post_delete], sender=Hospital)
+@receiver([post_save, post_delete], sender=HospitalStaff)
+def invalidate_hospital_cache(sender, **kwargs):
+    """Hospital and staff writes invalidate cached hospital profiles"""
+    bump_version('hospital')
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_donor_user_cache(sender, instance, **kwargs):
+    """Donor details embed the user's email and phone number"""
+    if instance.user_type == 'donor':
+        bump_version('donor')
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_auth_context(sender, instance, **kwargs):
+    invalidate_user_context(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=HospitalStaff)
+def invalidate_staff_auth_context(sender, instance, **kwargs):
+    invalidate_user_context(instance.user_id)
+
+
+@receiver(post_save, sender=Hospital)
+def invalidate_hospital_auth_context(sender, instance, **kwargs):
+    """Staff contexts embed the hospital (deletes cascade to the staff rows)"""
+    invalidate_user_context(*HospitalStaff.objects.filter(hospital=instance).values_list('user_id', flat=True))
@@ -6,4 +6,7 @@ urlpatterns = [
     path('register/hospital/', views.hospital_registration, name='hospital-registration'),
     path('login/', views.user_login, name='user-login'),
     path('profile/', views.user_profile, name='user-profile'),
+    path('token/refresh/', views.token_refresh, name='token-refresh'),
+    path('logout/', views.logout, name='logout'),
+    path('logout/all/', views.revoke_all_tokens, name='logout-all'),
 ]
\ No newline at end of file
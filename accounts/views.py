@@ -2,9 +2,13 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.utils import timezone
 from .models import User, Hospital, HospitalStaff
+from .revocation import revoke, is_revoked, issued_before_cutoff
 import logging
 from logs.utils import DatabaseLogger
 from .serializers import (
@@ -175,4 +179,74 @@ def user_profile(request):
         return Response(serializer.data)
     except Exception as e:
         logger.error(f"Profile fetch error: {str(e)}")
-        return Response({'error': 'Profile fetch failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': 'Profile fetch failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def token_refresh(request):
+    """Exchange a refresh token for a new access token (and, with rotation, a new refresh token)"""
+    try:
+        raw_token = request.data.get('refresh')
+        if not raw_token:
+            return Response({'error': 'Refresh token is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            refresh = RefreshToken(raw_token)
+        except TokenError:
+            return Response({'error': 'Invalid or expired refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        user = User.objects.filter(id=refresh.get(api_settings.USER_ID_CLAIM), is_active=True).first()
+        if user is None or is_revoked(refresh) or issued_before_cutoff(refresh, user):
+            return Response({'error': 'Invalid or expired refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        if not api_settings.ROTATE_REFRESH_TOKENS:
+            return Response({'access': str(refresh.access_token)})
+        
+        # Rotation: the old refresh token stops working once a new one is issued
+        if api_settings.BLACKLIST_AFTER_ROTATION:
+            revoke(refresh, user)
+        new_refresh = RefreshToken.for_user(user)
+        return Response({
+            'access': str(new_refresh.access_token),
+            'refresh': str(new_refresh)
+        })
+    except Exception as e:
+        logger.error(f"Token refresh error: {str(e)}")
+        return Response({'error': 'Token refresh failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout(request):
+    """Revoke the access token used for this call and, if given, its refresh token"""
+    try:
+        revoke(request.auth, request.user)
+        
+        raw_token = request.data.get('refresh')
+        if raw_token:
+            try:
+                refresh = RefreshToken(raw_token)
+            except TokenError:
+                refresh = None
+            if refresh is not None and str(refresh.get(api_settings.USER_ID_CLAIM)) == str(request.user.id):
+                revoke(refresh, request.user)
+        
+        logger.info(f"User logged out: {request.user.username}")
+        return Response({'message': 'Logged out successfully'})
+    except Exception as e:
+        logger.error(f"Logout error: {str(e)}")
+        return Response({'error': 'Logout failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def revoke_all_tokens(request):
+    """Log out everywhere: every token issued to this user so far stops working"""
+    try:
+        # Second precision, like the tokens' iat claim
+        request.user.tokens_valid_after = timezone.now().replace(microsecond=0)
+        request.user.save(update_fields=['tokens_valid_after', 'updated_at'])
+        
+        logger.info(f"All tokens revoked for user: {request.user.username}")
+        return Response({'message': 'All sessions have been logged out'})
+    except Exception as e:
+        logger.error(f"Revoke all tokens error: {str(e)}")
+        return Response({'error': 'Failed to revoke tokens'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
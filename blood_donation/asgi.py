@@ -2,6 +2,8 @@
 ASGI config for blood_donation project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it under an ASGI server (uvicorn, daphne) to serve the server-sent events
+stream at /api/requests/events/.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,23 @@
+"""
+Shared helpers for the bulk action endpoints (bulk request approval and
+rejection, bulk donor verification).
+"""
+from django.conf import settings
+
+
+def parse_id_list(data, key):
+    """
+    ``data[key]`` as a de-duplicated list of ints, in the order given.
+    Raises ValueError with a message suitable for a 400 response.
+    """
+    ids = data.get(key)
+    if not isinstance(ids, list) or not ids:
+        raise ValueError(f"{key} must be a non-empty list of ids")
+    limit = getattr(settings, 'BULK_ACTION_MAX_ITEMS', 500)
+    if len(ids) > limit:
+        raise ValueError(f"At most {limit} ids per call")
+    try:
+        ids = [int(item_id) for item_id in ids]
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must contain only integer ids")
+    return list(dict.fromkeys(ids))
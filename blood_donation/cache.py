@@ -0,0 +1,126 @@
+"""
+Versioned response cache for read-heavy API endpoints.
+
+Cached payloads are stored under keys that embed the current version counter
+of every model the payload was built from. Saving one of those models bumps
+its counter (see the ``signals`` module of each app), so invalidation is a
+single ``incr`` and old entries are never read again - they simply age out.
+
+The cache backend is whatever ``RESPONSE_CACHE_ALIAS`` points to in
+``CACHES`` (locmem by default, Redis/Memcached in production).
+"""
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = 'cachever'
+RESPONSE_KEY_PREFIX = 'resp'
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _record(name, outcome):
+    with _stats_lock:
+        counters = _stats.setdefault(name, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+
+def get_version(name):
+    """Return the current version counter for a model group"""
+    key = f"{VERSION_KEY_PREFIX}:{name}"
+    cache = _cache()
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _incr_version(name):
+    key = f"{VERSION_KEY_PREFIX}:{name}"
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key was evicted or never set: start a fresh sequence
+        cache.set(key, 2, timeout=None)
+
+
+def bump_version(name):
+    """
+    Invalidate every cached payload that depends on ``name``.
+
+    The counter is bumped immediately and again once the surrounding
+    transaction commits, so a reader that cached uncommitted-era data in
+    between cannot keep serving it.
+    """
+    try:
+        _incr_version(name)
+        transaction.on_commit(lambda: _incr_version(name))
+    except Exception as e:
+        logger.error(f"Cache version bump failed for {name}: {str(e)}")
+
+
+def make_key(name, depends_on, params=None):
+    versions = '.'.join(f"{dep}{get_version(dep)}" for dep in depends_on)
+    raw_params = repr(sorted((params or {}).items()))
+    digest = hashlib.sha1(raw_params.encode('utf-8')).hexdigest()
+    return f"{RESPONSE_KEY_PREFIX}:{name}:{versions}:{digest}"
+
+
+def get_or_build(name, depends_on, build, params=None):
+    """
+    Return ``(payload, hit)`` for the cached payload ``name``.
+
+    ``depends_on`` lists the model groups whose versions are part of the key,
+    ``params`` holds anything else the payload varies on (query string,
+    user id, today's date...). ``build`` is only called on a miss.
+    """
+    try:
+        key = make_key(name, depends_on, params)
+        payload = _cache().get(key)
+    except Exception as e:
+        logger.error(f"Response cache read failed for {name}: {str(e)}")
+        return build(), False
+
+    if payload is not None:
+        _record(name, 'hits')
+        return payload, True
+
+    _record(name, 'misses')
+    payload = build()
+    try:
+        _cache().set(key, payload, _timeout())
+    except Exception as e:
+        logger.error(f"Response cache write failed for {name}: {str(e)}")
+    return payload, False
+
+
+def get_stats():
+    """Hit/miss counters per cached endpoint for this process"""
+    with _stats_lock:
+        stats = {name: dict(counters) for name, counters in _stats.items()}
+    for counters in stats.values():
+        total = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / total, 4) if total else 0.0
+    return stats
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
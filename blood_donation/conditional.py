@@ -0,0 +1,45 @@
+"""
+ETag / conditional GET helpers for polling endpoints.
+
+The ETag is derived from ``max(updated_at)`` and a row count computed with a
+single indexed aggregate, so a poll that hits ``If-None-Match`` returns 304
+before any serialization happens.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def compute_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def queryset_state(queryset, field='updated_at'):
+    """Return ``(latest, count)`` for a queryset in one aggregate query"""
+    state = queryset.order_by().aggregate(latest=Max(field), count=Count('pk'))
+    return state['latest'], state['count']
+
+
+def not_modified(request, etag):
+    """Return a 304 response if the client already holds ``etag``, else None"""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return None
+
+    client_tags = [tag.strip() for tag in header.split(',')]
+    if '*' in client_tags or etag in client_tags or f'W/{etag}' in client_tags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        return with_etag(response, etag)
+    return None
+
+
+def with_etag(response, etag):
+    """Attach ``etag`` and make clients revalidate instead of reusing blindly"""
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization',))
+    return response
@@ -0,0 +1,151 @@
+"""
+Sparse fieldsets for API serializers.
+
+Serializers using ``SparseFieldsetMixin`` accept ``fields`` and ``expand``
+(comma separated, dotted names reach into nested serializers) and a
+``profile``:
+
+- ``full`` (default) renders every declared field, so write paths and
+  existing callers are unaffected.
+- ``compact`` leaves out ``Meta.expandable_fields`` (long free text,
+  many-to-many id lists...) unless they are named in ``expand``.
+
+``model_paths()`` reports the ORM paths the selected fields read, so views
+can narrow the SQL column list with ``.only()`` as well as the JSON.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+COMPACT = 'compact'
+FULL = 'full'
+
+
+def _split(value):
+    """'a,b.c,b.d' -> ({'a', 'b'}, {'b': ['c', 'd']})"""
+    top, nested = set(), {}
+    if not value:
+        return top, nested
+    if isinstance(value, str):
+        value = value.split(',')
+    for name in value:
+        name = name.strip()
+        if not name:
+            continue
+        head, _, rest = name.partition('.')
+        top.add(head)
+        if rest:
+            nested.setdefault(head, []).append(rest)
+    return top, nested
+
+
+def sparse_params(request, profile=COMPACT):
+    """Serializer kwargs taken from ``?fields=`` / ``?expand=``"""
+    return {
+        'fields': request.GET.get('fields'),
+        'expand': request.GET.get('expand'),
+        'profile': profile,
+    }
+
+
+def _select_related_paths(tree, prefix=''):
+    if not isinstance(tree, dict):
+        return []
+    paths = []
+    for name, subtree in tree.items():
+        path = f"{prefix}{name}"
+        paths.append(path)
+        paths.extend(_select_related_paths(subtree, f"{path}__"))
+    return paths
+
+
+class SparseFieldsetMixin:
+    def __init__(self, *args, fields=None, expand=None, profile=FULL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile
+        self.apply_fieldset(fields, expand)
+
+    def apply_fieldset(self, fields=None, expand=None):
+        wanted, nested_wanted = _split(fields)
+        expanded, nested_expanded = _split(expand)
+
+        if wanted:
+            allowed = wanted | expanded | {'id'}
+        elif self.profile == COMPACT:
+            hidden = set(getattr(self.Meta, 'expandable_fields', ())) - expanded
+            allowed = set(self.fields) - hidden
+        else:
+            allowed = set(self.fields)
+
+        for name in list(self.fields):
+            if name not in allowed:
+                self.fields.pop(name)
+
+        for name, field in self.fields.items():
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, SparseFieldsetMixin):
+                nested.profile = FULL if name in expanded and name not in nested_expanded else self.profile
+                nested.apply_fieldset(nested_wanted.get(name), nested_expanded.get(name))
+
+    def model_paths(self):
+        """
+        ORM paths read by the selected fields, for ``queryset.only()``.
+        Returns None when a field can't be mapped, meaning "load everything".
+        """
+        model = self.Meta.model
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+        paths = {'pk'}
+
+        for name, field in self.fields.items():
+            if name in dependencies:
+                paths.update(dependencies[name])
+                continue
+
+            nested = getattr(field, 'child', field)
+            source = field.source.replace('.', '__')
+            if isinstance(nested, SparseFieldsetMixin):
+                if isinstance(field, serializers.ListSerializer):
+                    continue  # reverse/many relations are loaded separately
+                nested_paths = nested.model_paths()
+                if nested_paths is None:
+                    return None
+                paths.add(source)
+                paths.update(f"{source}__{path}" for path in nested_paths if path != 'pk')
+                continue
+
+            if field.source == '*':
+                return None
+            resolved = self._resolve(model, source)
+            if resolved is None:
+                return None
+            if resolved:
+                paths.add(source)
+        return sorted(paths)
+
+    @staticmethod
+    def _resolve(model, path):
+        """True for a column path, False for a many-to-many, None if unknown"""
+        parts = path.split('__')
+        for index, part in enumerate(parts):
+            try:
+                model_field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            if model_field.many_to_many or model_field.one_to_many:
+                return False
+            if index < len(parts) - 1:
+                if not model_field.is_relation:
+                    return None
+                model = model_field.related_model
+        return True
+
+    @classmethod
+    def narrow(cls, queryset, *extra_paths, **params):
+        """
+        Restrict ``queryset`` to the columns the selected fields need, plus
+        ``extra_paths`` the view itself reads
+        """
+        paths = cls(**params).model_paths()
+        if not paths:
+            return queryset
+        # Relations followed by select_related() can't be deferred
+        return queryset.only(*paths, *extra_paths, *_select_related_paths(queryset.query.select_related))
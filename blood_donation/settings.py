@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'hospitals',
     'requests',
     'logs',
+    'locations',
 
 
 ]
@@ -71,6 +72,9 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'logs.middleware.LoggingMiddleware',
+    'logs.profiling.ProfilingMiddleware',
+    'logs.nplusone.NPlusOneMiddleware',
+    'logs.slow_queries.SlowQueryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -121,6 +125,75 @@ DATABASES = {
     }
 }
 
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) when running
+# several worker processes so cache versions are shared between them.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'blood-donation'),
+    }
+}
+
+# Versioned response cache (see blood_donation/cache.py)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Authenticated user + hospital context (see accounts/authentication.py)
+AUTH_CONTEXT_CACHE_ALIAS = 'default'
+AUTH_CONTEXT_CACHE_TIMEOUT = int(os.getenv('AUTH_CONTEXT_CACHE_TIMEOUT', 60))
+
+# Bulk donor import (see donors/importer.py): threads used to hash plain
+# text passwords; rows with password_hash or no password skip hashing.
+IMPORT_HASH_WORKERS = int(os.getenv('IMPORT_HASH_WORKERS', 4))
+
+# Bulk approve/reject/verify endpoints (see blood_donation/bulk.py)
+BULK_ACTION_MAX_ITEMS = int(os.getenv('BULK_ACTION_MAX_ITEMS', 500))
+
+# Donor notification delta sync (?since=<cursor>): each delta re-reads this
+# many seconds before the cursor, so changes from transactions that were
+# still open when the cursor was issued aren't missed. Keep it above the
+# longest write transaction.
+SYNC_CURSOR_LAG_SECONDS = int(os.getenv('SYNC_CURSOR_LAG_SECONDS', 60))
+
+# Server-sent events (see requests/events.py). Use CacheBackend with a
+# shared cache when running more than one ASGI worker or node.
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'requests.events.InProcessBackend')
+EVENTS_BACKEND_OPTIONS = {}
+EVENTS_HEARTBEAT_SECONDS = 25
+
+# Prometheus /metrics endpoint: reachable from these addresses (the socket
+# peer, REMOTE_ADDR; X-Forwarded-For is ignored), or with
+# "Authorization: Bearer <METRICS_TOKEN>" when a token is configured
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# On-demand profiling (see logs/profiling.py). Managers can send
+# "X-Profile: 1"; PROFILING_SAMPLE_RATE profiles a random share of requests.
+PROFILING_DIR = os.getenv('PROFILING_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+PROFILING_ALLOW_HEADER = os.getenv('PROFILING_ALLOW_HEADER', 'False').lower() == 'true'
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', 200))
+
+# N+1 query detection (see logs/nplusone.py), on by default with DEBUG.
+# NPLUSONE_STRICT raises instead of logging, e.g. for the test suite.
+NPLUSONE_ENABLED = os.getenv('NPLUSONE_ENABLED', str(DEBUG)).lower() == 'true'
+NPLUSONE_STRICT = os.getenv('NPLUSONE_STRICT', 'False').lower() == 'true'
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', 5))
+
+# Statements slower than this are stored with their EXPLAIN plan in the
+# SlowQuery table (see logs/slow_queries.py); 0 turns capture off
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 500))
+SLOW_QUERY_MAX_ROWS = int(os.getenv('SLOW_QUERY_MAX_ROWS', 10000))
+
+# Tracing spans (see logs/tracing.py), exported as OTLP-shaped NDJSON through
+# the 'traces' handler in LOGGING; TRACING_SAMPLE_RATE of traces are kept
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'False').lower() == 'true'
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', 0.1))
+TRACING_FILE = os.getenv('TRACING_FILE', os.path.join(BASE_DIR, 'traces.ndjson'))
+TRACING_SERVICE_NAME = 'blood-donation'
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,7 +201,7 @@ DATABASES = {
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -145,9 +218,27 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
+    'BLACKLIST_AFTER_ROTATION': True,  # enforced by accounts/revocation.py, not token_blacklist
 }
 
+# Revoked-token Bloom filter (see accounts/revocation.py)
+TOKEN_REVOCATION_SYNC_SECONDS = int(os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS = int(os.getenv('TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS', 60))
+TOKEN_REVOCATION_CAPACITY = 100000
+TOKEN_REVOCATION_ERROR_RATE = 0.001
+
+# Idempotency-Key replay for POST endpoints (see requests/idempotency.py).
+# A key stuck "in progress" (worker died mid-request) can be reused after
+# IDEMPOTENCY_LOCK_SECONDS.
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+# Duplicate blood requests (see requests/duplicates.py): 'merge' folds a
+# repeat submission into the open request, 'reject' answers 409. A window
+# of 0 turns detection off.
+DUPLICATE_REQUEST_WINDOW_HOURS = int(os.getenv('DUPLICATE_REQUEST_WINDOW_HOURS', 24))
+DUPLICATE_REQUEST_POLICY = os.getenv('DUPLICATE_REQUEST_POLICY', 'merge')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -210,6 +301,8 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER', 'noreply@blooddonation.com')
 REPLY_TO_EMAIL = os.getenv('REPLY_TO_EMAIL', 'support@blooddonation.com')
+# Messages per SMTP batch when bulk actions flush their EmailQueue
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 50))
 
 # Frontend URL for links in emails
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173/')
@@ -245,22 +338,56 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'logs.formatters.JsonFormatter',
+        },
+        'message': {
+            'format': '{message}',
+            'style': '{',
+        },
+    },
+    'filters': {
+        # Shared by all handlers: repeated INFO messages beyond LOG_DEDUP_BURST
+        # per LOG_DEDUP_WINDOW seconds are dropped and summarized
+        'dedup': {
+            '()': 'logs.filters.DeduplicateFilter',
+            'window': float(os.getenv('LOG_DEDUP_WINDOW', 60)),
+            'burst': int(os.getenv('LOG_DEDUP_BURST', 5)),
+            'sample_rate': float(os.getenv('LOG_DEDUP_SAMPLE_RATE', 0)),
+        },
     },
     'handlers': {
-        'file': {
+        'file': {   # Written by a background thread; rotated files are gzipped
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'logs.handlers.AsyncRotatingFileHandler',
             'filename': BASE_DIR / 'django.log',
-            'formatter': 'verbose',
+            'max_bytes': int(os.getenv('LOG_FILE_MAX_BYTES', 10 * 1024 * 1024)),
+            'backup_count': int(os.getenv('LOG_FILE_BACKUP_COUNT', 10)),
+            'when': os.getenv('LOG_FILE_ROTATE_WHEN') or None,  # e.g. 'midnight' for daily files
+            'formatter': os.getenv('LOG_FILE_FORMAT', 'verbose'),  # 'json' for JSON lines
+            'filters': ['dedup'],
         },
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
+            'filters': ['dedup'],
         },
-        'db': {   # ✅ NEW: Database log handler
+        'db': {   # ✅ NEW: Database log handler (batched, written off the request thread)
             'level': 'INFO',
-            'class': 'logs.handlers.DatabaseLogHandler',
+            'class': 'logs.handlers.BufferedDatabaseLogHandler',
+            'batch_size': int(os.getenv('DB_LOG_BATCH_SIZE', 100)),
+            'flush_interval': float(os.getenv('DB_LOG_FLUSH_INTERVAL', 2.0)),
+            'max_queue': int(os.getenv('DB_LOG_MAX_QUEUE', 10000)),
+            'filters': ['dedup'],
+        },
+        'traces': {   # Finished traces (logs/tracing.py), NDJSON, same queue/rotation as 'file'
+            'level': 'INFO',
+            'class': 'logs.handlers.AsyncRotatingFileHandler',
+            'filename': TRACING_FILE,
+            'max_bytes': int(os.getenv('TRACING_FILE_MAX_BYTES', 50 * 1024 * 1024)),
+            'backup_count': int(os.getenv('TRACING_FILE_BACKUP_COUNT', 5)),
+            'formatter': 'message',
         },
     },
     'loggers': {
@@ -274,6 +401,14 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        'traces': {
+            'handlers': ['traces'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'django.utils.autoreload': {   # "... changed, reloading" on every save in runserver
+            'level': 'WARNING',
+        },
     },
 }
 
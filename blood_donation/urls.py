@@ -18,6 +18,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from . import views
+from logs.views import export_logs, metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -25,6 +27,10 @@ urlpatterns = [
     path('api/donors/', include('donors.urls')),
     path('api/hospitals/', include('hospitals.urls')),
     path('api/requests/', include('requests.urls')),
+    path('api/locations/', include('locations.urls')),
+    path('api/cache/stats/', views.cache_stats, name='cache-stats'),
+    path('api/logs/export/', export_logs, name='export-logs'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,21 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from .cache import get_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cache_stats(request):
+    """Response cache hit/miss counters for this worker process"""
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({'endpoints': get_stats()})
+    except Exception as e:
+        logger.error(f"Cache stats error: {str(e)}")
+        return Response({'error': 'Failed to fetch cache statistics'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
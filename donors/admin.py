@@ -4,7 +4,8 @@ from .models import Donor
 @admin.register(Donor)
 class DonorAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'blood_group', 'is_verified', 'is_available', 'city')
-    list_filter = ('blood_group', 'is_verified', 'is_available', 'city')
+    # city_ref lists City rows instead of a DISTINCT over the donor table
+    list_filter = ('blood_group', 'is_verified', 'is_available', 'state_ref', 'city_ref')
     search_fields = ('full_name', 'user__username')
     list_editable = ('is_verified', 'is_available')
 
@@ -3,8 +3,8 @@ from .models import Donor
 
 class DonorFilter(django_filters.FilterSet):
     blood_group = django_filters.ChoiceFilter(choices=Donor.BLOOD_GROUP_CHOICES)
-    city = django_filters.CharFilter(lookup_expr='icontains')
-    state = django_filters.CharFilter(lookup_expr='icontains')
+    city = django_filters.CharFilter(method='filter_city')
+    state = django_filters.CharFilter(method='filter_state')
     country = django_filters.CharFilter(lookup_expr='icontains')
     gender = django_filters.ChoiceFilter(choices=Donor.GENDER_CHOICES)
     
@@ -16,6 +16,26 @@ class DonorFilter(django_filters.FilterSet):
         model = Donor
         fields = ['blood_group', 'city', 'state', 'country', 'gender']
     
+    def filter_city(self, queryset, name, value):
+        """
+        Known city names and aliases match on city_ref; anything else, and
+        donors whose address hasn't resolved, fall back to icontains
+        """
+        from django.db.models import Q
+        from locations.matching import resolve
+        city_id, _ = resolve(value, self.data.get('state'))
+        if city_id:
+            return queryset.filter(Q(city_ref_id=city_id) | Q(city_ref__isnull=True, city__icontains=value))
+        return queryset.filter(city__icontains=value)
+    
+    def filter_state(self, queryset, name, value):
+        from django.db.models import Q
+        from locations.matching import resolve
+        _, state_id = resolve('', value)
+        if state_id:
+            return queryset.filter(Q(state_ref_id=state_id) | Q(state_ref__isnull=True, state__icontains=value))
+        return queryset.filter(state__icontains=value)
+    
     def filter_min_age(self, queryset, name, value):
         from datetime import date
         from dateutil.relativedelta import relativedelta
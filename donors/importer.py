@@ -0,0 +1,232 @@
+"""
+Bulk donor import shared by ``manage.py import_donors`` and the manager
+import endpoint.
+
+Rows (CSV with a header, or JSON lines) use the same keys as
+``donor_registration`` and are validated with the registration rules:
+``UserRegistrationSerializer`` for the account and
+``DonorRegistrationSerializer`` for the profile. Lookups those serializers
+would run per row (username uniqueness, the ``user`` foreign key) are done
+once per chunk instead, and valid rows are written with ``bulk_create``,
+one transaction per chunk.
+
+Passwords are the expensive part of registration, so each row may give:
+
+- ``password_hash``: an already hashed Django password, stored as is;
+- ``password``: hashed here, spread over ``IMPORT_HASH_WORKERS`` threads;
+- neither: the account gets an unusable password and the donor sets one
+  through the password reset flow.
+"""
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
+from rest_framework import serializers
+from accounts.models import User
+from accounts.serializers import UserRegistrationSerializer
+from blood_donation.cache import bump_version
+from locations.matching import resolve
+from .models import Donor
+from .serializers import DonorRegistrationSerializer
+
+USER_FIELDS = ('username', 'email', 'password', 'password2', 'password_hash', 'phone_number')
+FORMATS = ('csv', 'jsonl')
+
+
+class UserImportSerializer(UserRegistrationSerializer):
+    password = serializers.CharField(write_only=True, required=False, allow_blank=True, validators=[validate_password])
+    password2 = serializers.CharField(write_only=True, required=False, allow_blank=True)
+    password_hash = serializers.CharField(write_only=True, required=False, allow_blank=True)
+
+    class Meta(UserRegistrationSerializer.Meta):
+        fields = USER_FIELDS
+        # Uniqueness is checked once per chunk by DonorImporter
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
+
+    def validate(self, attrs):
+        if attrs.get('password2') and attrs.get('password') != attrs['password2']:
+            raise serializers.ValidationError({"password": "Password fields didn't match."})
+        if attrs.get('password_hash'):
+            try:
+                identify_hasher(attrs['password_hash'])
+            except ValueError:
+                raise serializers.ValidationError({"password_hash": "Unrecognized password hash format."})
+        return attrs
+
+
+class DonorImportSerializer(DonorRegistrationSerializer):
+    class Meta(DonorRegistrationSerializer.Meta):
+        fields = None
+        exclude = ('user',)
+
+
+def location_refs(donor_data):
+    city_ref_id, state_ref_id = resolve(donor_data['city'], donor_data['state'])
+    return {'city_ref_id': city_ref_id, 'state_ref_id': state_ref_id}
+
+
+def detect_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_rows(stream, file_format):
+    """
+    Yield ``(row number, dict)`` from a text stream, or ``(row number,
+    ValueError)`` for lines that can't be parsed. Empty CSV cells are left
+    out so model defaults apply.
+    """
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=2):
+            yield number, {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value is not None and value.strip() != ''
+            }
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield number, ValueError('Each line must be a JSON object')
+            continue
+        yield number, row
+
+
+class DonorImporter:
+    def __init__(self, chunk_size=1000, dry_run=False, hash_workers=None):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.hash_workers = hash_workers or getattr(settings, 'IMPORT_HASH_WORKERS', 4)
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+        self._seen_usernames = set()
+
+    def run(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                self.process_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.process_chunk(chunk)
+        self.errors.sort(key=lambda error: error['row'])
+        return self
+
+    def fail(self, number, row, errors):
+        username = row.get('username', '') if isinstance(row, dict) else ''
+        self.errors.append({'row': number, 'username': username, 'errors': errors})
+
+    def validate(self, number, row):
+        user_serializer = UserImportSerializer(data={key: row[key] for key in USER_FIELDS if key in row})
+        donor_serializer = DonorImportSerializer(data={
+            key: value for key, value in row.items() if key not in USER_FIELDS
+        })
+        errors = {}
+        if not user_serializer.is_valid():
+            errors.update(user_serializer.errors)
+        if not donor_serializer.is_valid():
+            errors.update(donor_serializer.errors)
+        if errors:
+            self.fail(number, row, errors)
+            return None
+        return user_serializer.validated_data, donor_serializer.validated_data
+
+    def process_chunk(self, chunk):
+        self.rows += len(chunk)
+        valid = []
+        for number, row in chunk:
+            if isinstance(row, Exception):
+                self.fail(number, {}, {'row': [str(row)]})
+                continue
+            validated = self.validate(number, row)
+            if validated is None:
+                continue
+            username = validated[0]['username']
+            if username in self._seen_usernames:
+                self.fail(number, row, {'username': ['Duplicate username earlier in the file.']})
+                continue
+            self._seen_usernames.add(username)
+            valid.append((number, row, *validated))
+
+        taken = set(User.objects.filter(
+            username__in=[user_data['username'] for _, _, user_data, _ in valid]
+        ).values_list('username', flat=True))
+        rows = []
+        for number, row, user_data, donor_data in valid:
+            if user_data['username'] in taken:
+                self.fail(number, row, {'username': ['A user with that username already exists.']})
+            else:
+                rows.append((user_data, donor_data))
+        if not rows:
+            return
+        if self.dry_run:
+            # Count what would have been created
+            self.created += len(rows)
+            return
+
+        users = self.build_users([user_data for user_data, _ in rows])
+        with transaction.atomic():
+            users = User.objects.bulk_create(users)
+            if users[0].pk is None:
+                # Backends that can't return ids from a bulk insert
+                ids = dict(User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list('username', 'id'))
+                for user in users:
+                    user.pk = ids[user.username]
+            # bulk_create skips the pre_save signal that fills these in
+            Donor.objects.bulk_create([
+                Donor(user_id=user.pk, **donor_data, **location_refs(donor_data))
+                for user, (_, donor_data) in zip(users, rows)
+            ])
+        self.created += len(rows)
+        # bulk_create skips the post_save signal that normally does this
+        bump_version('donor')
+
+    def build_users(self, users_data):
+        users = [
+            User(
+                username=data['username'],
+                email=data.get('email', ''),
+                phone_number=data.get('phone_number', ''),
+                user_type='donor',
+                password=data.get('password_hash') or None,
+            )
+            for data in users_data
+        ]
+        to_hash = [(user, data['password']) for user, data in zip(users, users_data)
+                   if not user.password and data.get('password')]
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+                hashes = pool.map(make_password, [password for _, password in to_hash])
+                for (user, _), hashed in zip(to_hash, hashes):
+                    user.password = hashed
+        for user in users:
+            if not user.password:
+                user.set_unusable_password()
+        return users
+
+    def summary(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'failed': len(self.errors),
+            'dry_run': self.dry_run,
+        }
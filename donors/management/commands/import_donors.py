@@ -0,0 +1,56 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from donors.importer import FORMATS, DonorImporter, detect_format, read_rows
+
+class Command(BaseCommand):
+    help = 'Bulk import donors from a CSV or JSON lines file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with a header row) or JSONL file')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='File format (default: from the file extension)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows validated and inserted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate only, without creating anything'
+        )
+        parser.add_argument(
+            '--report',
+            help='Write the per-row error report to this file (JSON lines)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        
+        file_format = options['format'] or detect_format(options['path'])
+        importer = DonorImporter(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as source:
+                importer.run(read_rows(source, file_format))
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+        
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as report:
+                for error in importer.errors:
+                    report.write(json.dumps(error) + '\n')
+        else:
+            for error in importer.errors[:20]:
+                self.stdout.write(f"Row {error['row']} ({error['username'] or '-'}): {json.dumps(error['errors'])}")
+            if len(importer.errors) > 20:
+                self.stdout.write(f"... and {len(importer.errors) - 20} more (use --report)")
+        
+        verb = 'Would create' if options['dry_run'] else 'Created'
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ {verb} {importer.created} donors from {importer.rows} rows ({len(importer.errors)} failed)")
+        )
@@ -0,0 +1,64 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from donors.reconcile import FIELDS, fix_drift, iter_drift
+
+class Command(BaseCommand):
+    help = 'Recompute donor total_donations/last_donation_date from donation records and fix drift'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Donors compared and updated per batch (default: 5000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the differences'
+        )
+        parser.add_argument(
+            '--report',
+            help='Write every difference to this CSV file'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Differences to print (default: 20)'
+        )
+    
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        
+        report = None
+        if options['report']:
+            report_file = open(options['report'], 'w', encoding='utf-8', newline='')
+            report = csv.writer(report_file)
+            report.writerow(['donor_id', 'full_name', 'field', 'stored', 'expected'])
+        
+        drifted = fixed = printed = 0
+        try:
+            for drift in iter_drift(options['chunk_size']):
+                drifted += len(drift)
+                for donor, changes in drift:
+                    for field, (stored, expected) in changes.items():
+                        if report:
+                            report.writerow([donor.id, donor.full_name, field, stored, expected])
+                    if printed < options['limit']:
+                        diff = ', '.join(f"{field} {stored} -> {expected}" for field, (stored, expected) in changes.items())
+                        self.stdout.write(f"Donor {donor.id} ({donor.full_name}): {diff}")
+                        printed += 1
+                if not options['dry_run']:
+                    fixed += fix_drift(drift)
+        finally:
+            if report:
+                report_file.close()
+        
+        if drifted > printed:
+            self.stdout.write(f"... and {drifted - printed} more")
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {drifted} donors have {'/'.join(FIELDS)} out of sync")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ Reconciled {fixed} donors"))
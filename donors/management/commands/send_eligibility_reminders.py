@@ -0,0 +1,42 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from donors.reminders import eligibility_window, send_reminders
+
+class Command(BaseCommand):
+    help = 'Email donors whose 3-month donation gap ends on the given day (run daily)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Eligibility date, YYYY-MM-DD (default: today)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Emails per SMTP batch (default: EMAIL_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the donors who would be reminded'
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options['date']) if options['date'] else date.today()
+        except ValueError:
+            raise CommandError('--date must be YYYY-MM-DD')
+        
+        window = eligibility_window(day)
+        if window is None:
+            self.stdout.write(f"Nobody becomes eligible on {day}")
+            return
+        
+        stats = send_reminders(day, batch_size=options['batch_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f"Would remind {stats['due']} donors (last donation {window[0]} to {window[1]})")
+            return
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Sent {stats['sent']} eligibility reminders for {day} ({stats['failed']} failed)")
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donors', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donor',
+            index=models.Index(fields=['is_verified', 'is_available', 'updated_at'], name='donors_dono_is_veri_5b6f5f_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donors', '0002_donor_availability_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='donor',
+            name='last_donation_date',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='EligibilityReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('eligible_from', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligibility_reminders', to='donors.donor')),
+            ],
+            options={
+                'unique_together': {('donor', 'eligible_from')},
+            },
+        ),
+    ]
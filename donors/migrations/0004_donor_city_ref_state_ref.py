@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donors', '0003_eligibilityreminder_last_donation_date_index'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donor',
+            name='city_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donors', to='locations.city'),
+        ),
+        migrations.AddField(
+            model_name='donor',
+            name='state_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donors', to='locations.state'),
+        ),
+    ]
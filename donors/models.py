@@ -57,6 +57,11 @@ class Donor(models.Model):
     state = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
     pincode = models.CharField(max_length=10)
+    # Normalized city/state, kept in step with the text fields (see locations/matching.py)
+    city_ref = models.ForeignKey('locations.City', on_delete=models.SET_NULL, null=True, blank=True,
+                                 editable=False, related_name='donors')
+    state_ref = models.ForeignKey('locations.State', on_delete=models.SET_NULL, null=True, blank=True,
+                                  editable=False, related_name='donors')
     
     # Health information
     has_chronic_disease = models.BooleanField(default=False)
@@ -66,7 +71,7 @@ class Donor(models.Model):
     allergies = models.TextField(blank=True)
     
     # Donation history
-    last_donation_date = models.DateField(null=True, blank=True)
+    last_donation_date = models.DateField(null=True, blank=True, db_index=True)
     total_donations = models.IntegerField(default=0)
     is_available = models.BooleanField(default=True)
     
@@ -77,7 +82,10 @@ class Donor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_verified', 'is_available', 'updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.blood_group})"
@@ -91,6 +99,8 @@ class Donor(models.Model):
         self.last_donation_date = date.today()
         self.total_donations = models.F('total_donations') + 1
         self.save(update_fields=['last_donation_date', 'total_donations'])
+        # Replace the F() expression with the stored value
+        self.refresh_from_db(fields=['total_donations'])
     
     def can_donate_based_on_time(self):
         """Check if donor can donate based on time gap (3 months)"""
@@ -162,4 +172,20 @@ class Donor(models.Model):
             if can_donate:
                 eligible_donors.append(donor)
         
-        return eligible_donors
\ No newline at end of file
+        return eligible_donors
+
+
+class EligibilityReminder(models.Model):
+    """
+    Checkpoint for the eligibility reminder job: one row per donor and
+    eligibility date once the reminder has gone out, so re-runs skip them
+    """
+    donor = models.ForeignKey(Donor, on_delete=models.CASCADE, related_name='eligibility_reminders')
+    eligible_from = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('donor', 'eligible_from')
+
+    def __str__(self):
+        return f"Reminder for {self.donor.full_name} ({self.eligible_from})"
@@ -0,0 +1,81 @@
+"""
+Recompute the denormalized ``Donor.total_donations`` and
+``Donor.last_donation_date`` from donation records.
+
+``update_donation_record()`` bumps both counters right after a
+``DonationRecord`` is created. If anything fails in between, they drift.
+``iter_drift`` walks donors in id-ordered chunks and runs one grouped
+aggregate per chunk over the hot and archived donation records, so memory
+stays bounded however many donors there are. It yields the donors whose
+stored values differ, and ``fix_drift`` writes the corrections with
+``bulk_update``.
+"""
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from blood_donation.cache import bump_version
+from .models import Donor
+
+FIELDS = ('total_donations', 'last_donation_date')
+
+
+def donation_stats(donor_ids):
+    """{donor_id: (count, last donation date)} across hot and archived records"""
+    from requests.models import ArchivedDonationRecord, DonationRecord
+    
+    stats = {}
+    for model in (DonationRecord, ArchivedDonationRecord):
+        rows = model.objects.filter(donor_id__in=donor_ids).values('donor_id').annotate(
+            total=Count('id'), last=Max('donation_date')
+        ).order_by()
+        for row in rows:
+            total, last = stats.get(row['donor_id'], (0, None))
+            stats[row['donor_id']] = (total + row['total'], max(filter(None, (last, row['last'])), default=None))
+    return {
+        donor_id: (total, timezone.localdate(last) if last else None)
+        for donor_id, (total, last) in stats.items()
+    }
+
+
+def iter_drift(chunk_size=5000):
+    """Yield ``(donor, {field: (stored, expected)})`` lists, one per chunk"""
+    last_id = 0
+    while True:
+        donors = list(
+            Donor.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'full_name', *FIELDS)[:chunk_size]
+        )
+        if not donors:
+            return
+        last_id = donors[-1].id
+        
+        stats = donation_stats([donor.id for donor in donors])
+        drift = []
+        for donor in donors:
+            expected = dict(zip(FIELDS, stats.get(donor.id, (0, None))))
+            changes = {
+                field: (getattr(donor, field), value)
+                for field, value in expected.items()
+                if getattr(donor, field) != value
+            }
+            if changes:
+                drift.append((donor, changes))
+        yield drift
+
+
+def fix_drift(drift):
+    """Apply one chunk of ``iter_drift`` output with a single bulk_update"""
+    if not drift:
+        return 0
+    now = timezone.now()
+    donors = []
+    for donor, changes in drift:
+        for field, (_, expected) in changes.items():
+            setattr(donor, field, expected)
+        # bulk_update skips auto_now
+        donor.updated_at = now
+        donors.append(donor)
+    with transaction.atomic():
+        Donor.objects.bulk_update(donors, [*FIELDS, 'updated_at'], batch_size=1000)
+    bump_version('donor')
+    return len(donors)
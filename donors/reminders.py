@@ -0,0 +1,109 @@
+"""
+"You can donate again" reminders.
+
+Donors may donate 3 months after ``last_donation_date`` (see
+``Donor.can_donate_based_on_time``). Rather than checking every donor,
+``due_donors(day)`` turns "eligible from ``day``" into a
+``last_donation_date`` range and does one indexed query. The range is
+usually a single date; it is wider where month ends clamp, e.g. Nov 28-30
+all become eligible on Feb 28.
+
+``send_reminders`` emails them in ``EMAIL_BATCH_SIZE`` batches over one
+SMTP connection. After each batch is accepted it records an
+``EligibilityReminder`` checkpoint per donor, so a re-run for the same day
+only picks up donors whose batch failed.
+"""
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.mail import get_connection
+from requests.email_utils import EmailQueue, build_eligibility_reminder_email
+from .models import Donor, EligibilityReminder
+import logging
+
+logger = logging.getLogger(__name__)
+
+GAP = relativedelta(months=3)
+
+
+def eligibility_window(day):
+    """``(first, last)`` last donation dates whose gap ends on ``day``, or None"""
+    start = day - GAP
+    dates = [start + timedelta(days=offset) for offset in range(-3, 4)]
+    dates = [last_donation for last_donation in dates if last_donation + GAP == day]
+    return (dates[0], dates[-1]) if dates else None
+
+
+def due_donors(day):
+    """Donors who become eligible on ``day`` and haven't been reminded yet"""
+    window = eligibility_window(day)
+    if window is None:
+        return Donor.objects.none()
+    return Donor.objects.filter(
+        last_donation_date__range=window,
+        is_verified=True,
+        is_available=True,
+        has_chronic_disease=False,
+        weight__gte=45,
+    ).exclude(user__email='').exclude(
+        eligibility_reminders__eligible_from=day
+    ).select_related('user').order_by('id')
+
+
+def iter_due_donors(day, page_size=1000):
+    """``due_donors`` in id-ordered pages, so checkpoint writes between
+    batches never overlap an open cursor"""
+    last_id = 0
+    while True:
+        page = list(due_donors(day).filter(id__gt=last_id)[:page_size])
+        if not page:
+            return
+        last_id = page[-1].id
+        yield from page
+
+
+def send_reminders(day, batch_size=None, dry_run=False):
+    batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 50)
+    stats = {'due': 0, 'sent': 0, 'failed': 0}
+    
+    def checkpoint(messages, sent):
+        # send_messages reports a count, not which ones failed, so only a
+        # fully accepted batch is checkpointed
+        if sent == len(messages):
+            EligibilityReminder.objects.bulk_create(
+                [EligibilityReminder(donor_id=message.donor_id, eligible_from=day) for message in messages],
+                ignore_conflicts=True
+            )
+    
+    donors = (donor for donor in iter_due_donors(day) if 18 <= donor.age <= 60)
+    connection = None if dry_run else get_connection()
+    try:
+        if connection is not None:
+            connection.open()
+        while True:
+            queue = EmailQueue(batch_size)
+            for donor in donors:
+                stats['due'] += 1
+                if dry_run:
+                    continue
+                try:
+                    message = build_eligibility_reminder_email(donor, day)
+                except Exception as e:
+                    logger.error(f"Failed to build eligibility reminder for donor {donor.id}: {str(e)}")
+                    stats['failed'] += 1
+                    continue
+                message.donor_id = donor.id
+                queue.add(message)
+                if queue.depth >= batch_size:
+                    break
+            if not queue.depth:
+                break
+            queue.flush(connection=connection, on_batch=checkpoint)
+            stats['sent'] += queue.sent
+            stats['failed'] += queue.failed
+    finally:
+        if connection is not None:
+            connection.close()
+    
+    logger.info(f"Eligibility reminders for {day}: {stats['sent']} sent, {stats['failed']} failed")
+    return stats
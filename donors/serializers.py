@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Donor
+from blood_donation.serializers import SparseFieldsetMixin
 
 class DonorRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,7 +42,7 @@ class DonorListSerializer(serializers.ModelSerializer):
         can_donate, message = obj.can_donate()
         return message
 
-class DonorDetailSerializer(serializers.ModelSerializer):
+class DonorDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     age = serializers.ReadOnlyField()
     email = serializers.CharField(source='user.email', read_only=True)
     phone_number = serializers.CharField(source='user.phone_number', read_only=True)
@@ -51,6 +52,15 @@ class DonorDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Donor
         fields = '__all__'
+        # Medical free text is only sent in compact mode when expanded
+        expandable_fields = ('address', 'chronic_disease_details', 'recent_medications',
+                             'recent_surgeries', 'allergies', 'verification_notes')
+        # Columns read by computed fields, for queryset.only()
+        field_dependencies = {
+            'age': ['date_of_birth'],
+            'can_donate_now': ['date_of_birth', 'weight', 'has_chronic_disease', 'last_donation_date'],
+            'next_eligible_date': ['last_donation_date'],
+        }
     
     def get_can_donate_now(self, obj):
         can_donate, _ = obj.can_donate()
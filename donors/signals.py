@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from blood_donation.cache import bump_version
+from .models import Donor
+
+
+@receiver([post_save, post_delete], sender=Donor)
+def invalidate_donor_cache(sender, **kwargs):
+    """Any donor write invalidates cached donor lists and details"""
+    bump_version('donor')
@@ -6,6 +6,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .models import Donor
 from .serializers import DonorListSerializer, DonorDetailSerializer
 from .filters import DonorFilter
+from blood_donation.cache import get_or_build
+from blood_donation.serializers import sparse_params, FULL
+from requests.idempotency import idempotent
+from datetime import date
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,27 +22,39 @@ def donor_list(request):
         if request.user.user_type not in ['blood_bank_manager', 'hospital_staff']:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        donors = Donor.objects.filter(is_verified=True, is_available=True)
-        
-        # Apply filters
-        donor_filter = DonorFilter(request.GET, queryset=donors)
-        filtered_donors = donor_filter.qs
+        def build():
+            donors = Donor.objects.filter(is_verified=True, is_available=True)
+            
+            # Apply filters
+            donor_filter = DonorFilter(request.GET, queryset=donors)
+            filtered_donors = donor_filter.qs
+            
+            # Enhance donor data with eligibility info
+            enhanced_donors = []
+            for donor in filtered_donors:
+                can_donate, message = donor.can_donate()
+                donor_data = DonorListSerializer(donor).data
+                donor_data['can_donate_now'] = can_donate
+                donor_data['eligibility_message'] = message
+                donor_data['last_donation_date'] = donor.last_donation_date
+                donor_data['total_donations'] = donor.total_donations
+                enhanced_donors.append(donor_data)
+            
+            return {
+                'count': filtered_donors.count(),
+                'donors': enhanced_donors
+            }
         
-        # Enhance donor data with eligibility info
-        enhanced_donors = []
-        for donor in filtered_donors:
-            can_donate, message = donor.can_donate()
-            donor_data = DonorListSerializer(donor).data
-            donor_data['can_donate_now'] = can_donate
-            donor_data['eligibility_message'] = message
-            donor_data['last_donation_date'] = donor.last_donation_date
-            donor_data['total_donations'] = donor.total_donations
-            enhanced_donors.append(donor_data)
+        # Only cache known filter combinations so arbitrary query strings
+        # can't flood the cache. Eligibility depends on today's date.
+        if set(request.GET.keys()) <= set(DonorFilter.base_filters):
+            params = {key: request.GET.get(key) for key in request.GET.keys()}
+            params['today'] = date.today().isoformat()
+            data, hit = get_or_build('donor_list', ('donor',), build, params)
+        else:
+            data, hit = build(), False
         
-        return Response({
-            'count': filtered_donors.count(),
-            'donors': enhanced_donors
-        })
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
     except Exception as e:
         logger.error(f"Donor list error: {str(e)}")
         return Response({'error': 'Failed to fetch donors'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -50,9 +66,17 @@ def donor_detail(request, donor_id):
         if request.user.user_type not in ['blood_bank_manager', 'hospital_staff']:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        donor = Donor.objects.get(id=donor_id, is_verified=True)
-        serializer = DonorDetailSerializer(donor)
-        return Response(serializer.data)
+        params = sparse_params(request, profile=FULL)
+        
+        def build():
+            donor = DonorDetailSerializer.narrow(
+                Donor.objects.select_related('user'), **params
+            ).get(id=donor_id, is_verified=True)
+            return DonorDetailSerializer(donor, **params).data
+        
+        key_params = {**params, 'donor_id': donor_id, 'today': date.today().isoformat()}
+        data, hit = get_or_build('donor_detail', ('donor',), build, key_params)
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
     except Donor.DoesNotExist:
         return Response({'error': 'Donor not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -68,7 +92,7 @@ def donor_profile(request):
         donor = Donor.objects.get(user=request.user)
         
         if request.method == 'GET':
-            serializer = DonorDetailSerializer(donor)
+            serializer = DonorDetailSerializer(donor, **sparse_params(request, profile=FULL))
             return Response(serializer.data)
             
         elif request.method == 'PUT':
@@ -106,16 +130,32 @@ def donation_history(request):
         from requests.serializers import DonationRecordSerializer
         
         donations = DonationRecord.objects.filter(donor=donor).select_related(
+            'donor',
             'blood_request', 
             'blood_request__hospital'
         ).order_by('-donation_date')
         
         serializer = DonationRecordSerializer(donations, many=True)
-        
-        return Response({
+        data = {
             'count': donations.count(),
             'donations': serializer.data
-        })
+        }
+        
+        # Donations of archived requests only when asked for
+        from requests.archive import wants_archived
+        if wants_archived(request):
+            from requests.models import ArchivedDonationRecord
+            from requests.serializers import ArchivedDonationRecordSerializer
+            
+            archived = ArchivedDonationRecord.objects.filter(donor=donor).select_related(
+                'donor',
+                'blood_request',
+                'blood_request__hospital'
+            ).order_by('-donation_date')
+            data['archived_count'] = archived.count()
+            data['archived_donations'] = ArchivedDonationRecordSerializer(archived, many=True).data
+        
+        return Response(data)
         
     except Donor.DoesNotExist:
         return Response({'error': 'Donor profile not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -123,3 +163,107 @@ def donation_history(request):
         logger.error(f"Donation history error: {str(e)}")
         return Response({'error': 'Failed to fetch donation history'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_donors(request):
+    """
+    Bulk import donors from an uploaded CSV or JSON lines file ("file").
+    Rows are validated like donor registration; dry_run=true only validates.
+    """
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Upload a CSV or JSONL file as "file"'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        from .importer import FORMATS, DonorImporter, detect_format, read_rows
+        import io
+        
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        if file_format not in FORMATS:
+            return Response({'error': f"file_format must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        importer = DonorImporter(dry_run=str(request.data.get('dry_run', '')).lower() in ('1', 'true'))
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        importer.run(read_rows(stream, file_format))
+        
+        logger.info(f"Donor import by {request.user.username}: {importer.created} created, {len(importer.errors)} failed")
+        return Response({
+            **importer.summary(),
+            'errors': importer.errors,
+        }, status=status.HTTP_201_CREATED if importer.created and not importer.dry_run else status.HTTP_200_OK)
+        
+    except UnicodeDecodeError:
+        return Response({'error': 'File must be UTF-8 encoded'}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"Donor import error: {str(e)}")
+        return Response({'error': 'Failed to import donors'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+def bulk_verify_donors(request):
+    """
+    Verify (or unverify) many donors in one call:
+    {"donor_ids": [...], "is_verified": true, "verification_notes": "..."}
+    """
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        from blood_donation.bulk import parse_id_list
+        from blood_donation.cache import bump_version
+        from django.db import transaction
+        from django.utils import timezone
+        
+        try:
+            donor_ids = parse_id_list(request.data, 'donor_ids')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        is_verified = request.data.get('is_verified', True)
+        if not isinstance(is_verified, bool):
+            return Response({'error': 'is_verified must be true or false'}, status=status.HTTP_400_BAD_REQUEST)
+        notes = request.data.get('verification_notes')
+        
+        fields = ['is_verified', 'updated_at'] + (['verification_notes'] if notes is not None else [])
+        results = []
+        changed = []
+        with transaction.atomic():
+            donors = Donor.objects.select_for_update().in_bulk(donor_ids)
+            now = timezone.now()
+            for donor_id in donor_ids:
+                donor = donors.get(donor_id)
+                if donor is None:
+                    results.append({'id': donor_id, 'error': 'Donor not found'})
+                    continue
+                if donor.is_verified == is_verified and notes is None:
+                    results.append({'id': donor_id, 'is_verified': is_verified, 'changed': False})
+                    continue
+                donor.is_verified = is_verified
+                if notes is not None:
+                    donor.verification_notes = notes
+                # bulk_update skips auto_now and the cache-busting post_save
+                donor.updated_at = now
+                changed.append(donor)
+                results.append({'id': donor_id, 'is_verified': is_verified, 'changed': True})
+            Donor.objects.bulk_update(changed, fields, batch_size=500)
+        
+        if changed:
+            bump_version('donor')
+        
+        logger.info(f"Bulk donor verification by {request.user.username}: {len(changed)} updated")
+        return Response({
+            'updated': len(changed),
+            'failed': sum(1 for result in results if 'error' in result),
+            'results': results,
+        })
+    
+    except Exception as e:
+        logger.error(f"Bulk donor verification error: {str(e)}")
+        return Response({'error': 'Failed to verify donors'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
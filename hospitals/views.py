@@ -2,25 +2,35 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone  # ADD THIS IMPORT
 from accounts.models import HospitalStaff
+from accounts.authentication import get_hospital_staff
 from donors.models import Donor
-from requests.models import BloodRequest, DonorNotification
-from requests.serializers import BloodRequestSerializer
+from requests.archive import wants_archived
+from requests.models import ArchivedBloodRequest, BloodRequest, DonorNotification
+from requests.serializers import ArchivedBloodRequestSerializer, BloodRequestSerializer
+from requests.idempotency import idempotent
+from requests.duplicates import find_duplicate, lock_hospital, merge_duplicate
+from blood_donation.cache import get_or_build, get_version
+from blood_donation.conditional import compute_etag, queryset_state, not_modified, with_etag
+from blood_donation.serializers import sparse_params
 import logging
 
 logger = logging.getLogger(__name__)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def create_blood_request(request):
     try:
         if request.user.user_type != 'hospital_staff':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         # Check if hospital staff and hospital are active
-        hospital_staff = HospitalStaff.objects.get(user=request.user)
+        hospital_staff = get_hospital_staff(request.user)
         if not hospital_staff.hospital.is_active:
             return Response({'error': 'Hospital account is not active'}, status=status.HTTP_403_FORBIDDEN)
         
@@ -31,16 +41,39 @@ def create_blood_request(request):
         
         serializer = BloodRequestSerializer(data=data)
         if serializer.is_valid():
-            # Create the blood request with 'pending' status (default)
-            blood_request = serializer.save()
+            # Check and create/merge under a per-hospital lock, so concurrent
+            # double submissions can't both miss the duplicate check
+            with transaction.atomic():
+                lock_hospital(hospital.id)
+                # Same patient/blood group already open at this hospital?
+                duplicate = find_duplicate(hospital.id, serializer.validated_data, for_update=True)
+                if duplicate is not None:
+                    if getattr(settings, 'DUPLICATE_REQUEST_POLICY', 'merge') == 'reject':
+                        return Response({
+                            'error': 'A matching request is already open',
+                            'request_id': duplicate.id,
+                            'status': duplicate.status
+                        }, status=status.HTTP_409_CONFLICT)
+                
+                    merge_duplicate(duplicate, serializer.validated_data, request.user)
+                    logger.info(f"Duplicate blood request from hospital {hospital.name} merged into {duplicate.id}")
+                    return Response({
+                        'message': 'A matching request is already open; this submission was merged into it.',
+                        'request_id': duplicate.id,
+                        'status': duplicate.status,
+                        'merged': True
+                    })
             
-            logger.info(f"Blood request created: {blood_request.id} by hospital {hospital.name} - Awaiting approval")
+                # Create the blood request with 'pending' status (default)
+                blood_request = serializer.save()
             
-            return Response({
-                'message': 'Blood request submitted for verification. Donors will be notified once approved.',
-                'request_id': blood_request.id,
-                'status': 'pending_approval'
-            }, status=status.HTTP_201_CREATED)
+                logger.info(f"Blood request created: {blood_request.id} by hospital {hospital.name} - Awaiting approval")
+            
+                return Response({
+                    'message': 'Blood request submitted for verification. Donors will be notified once approved.',
+                    'request_id': blood_request.id,
+                    'status': 'pending_approval'
+                }, status=status.HTTP_201_CREATED)
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except HospitalStaff.DoesNotExist:
@@ -57,14 +90,38 @@ def hospital_requests(request):
         if request.user.user_type != 'hospital_staff':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        hospital_staff = HospitalStaff.objects.get(user=request.user)
-        blood_requests = BloodRequest.objects.filter(hospital=hospital_staff.hospital)
+        hospital_staff = get_hospital_staff(request.user)
+        blood_requests = BloodRequest.objects.filter(hospital=hospital_staff.hospital_id)
+        
+        # Closed requests moved to the archive are only read when asked for
+        archived = None
+        if wants_archived(request):
+            archived = ArchivedBloodRequest.objects.filter(hospital=hospital_staff.hospital_id)
+        
+        etag = compute_etag(
+            'hospital_requests', hospital_staff.hospital_id,
+            *queryset_state(blood_requests), get_version('hospital'),
+            *(queryset_state(archived) if archived is not None else ())
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
         
-        serializer = BloodRequestSerializer(blood_requests, many=True)
-        return Response({
+        params = sparse_params(request)
+        serializer = BloodRequestSerializer(
+            BloodRequestSerializer.narrow(blood_requests.select_related('hospital'), **params),
+            many=True, **params
+        )
+        data = {
             'count': blood_requests.count(),
             'requests': serializer.data
-        })
+        }
+        if archived is not None:
+            data['archived_count'] = archived.count()
+            data['archived_requests'] = ArchivedBloodRequestSerializer(
+                archived.select_related('hospital').order_by('-created_at'), many=True
+            ).data
+        return with_etag(Response(data), etag)
     except HospitalStaff.DoesNotExist:
         return Response({'error': 'Hospital staff not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -80,23 +137,27 @@ def hospital_profile(request):
         if request.user.user_type != 'hospital_staff':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        hospital_staff = HospitalStaff.objects.get(user=request.user)
-        hospital = hospital_staff.hospital
+        def build():
+            hospital_staff = get_hospital_staff(request.user)
+            hospital = hospital_staff.hospital
+            
+            return {
+                'hospital_id': hospital.id,
+                'name': hospital.name,
+                'email': hospital.email,
+                'phone_number': hospital.phone_number,
+                'address': hospital.address,
+                'city': hospital.city,
+                'state': hospital.state,
+                'country': hospital.country,
+                'license_number': hospital.license_number,
+                'is_active': hospital.is_active,
+                'staff_designation': hospital_staff.designation,
+                'is_primary_contact': hospital_staff.is_primary_contact
+            }
         
-        return Response({
-            'hospital_id': hospital.id,
-            'name': hospital.name,
-            'email': hospital.email,
-            'phone_number': hospital.phone_number,
-            'address': hospital.address,
-            'city': hospital.city,
-            'state': hospital.state,
-            'country': hospital.country,
-            'license_number': hospital.license_number,
-            'is_active': hospital.is_active,
-            'staff_designation': hospital_staff.designation,
-            'is_primary_contact': hospital_staff.is_primary_contact
-        })
+        data, hit = get_or_build('hospital_profile', ('hospital',), build, {'user_id': request.user.id})
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
     except HospitalStaff.DoesNotExist:
         return Response({'error': 'Hospital staff not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -112,32 +173,35 @@ def hospital_stats(request):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         # Get hospital associated with the staff user
-        hospital_staff = HospitalStaff.objects.get(user=request.user)
+        hospital_staff = get_hospital_staff(request.user)
         hospital = hospital_staff.hospital
         
-        # Get total requests made by this hospital
-        total_requests = BloodRequest.objects.filter(hospital=hospital).count()
-        
-        # Get requests by status
-        pending_requests = BloodRequest.objects.filter(
-            hospital=hospital, 
-            status='pending'
-        ).count()
-        
-        approved_requests = BloodRequest.objects.filter(
-            hospital=hospital, 
-            status='approved'
-        ).count()
-        
-        completed_requests = BloodRequest.objects.filter(
-            hospital=hospital, 
-            status='completed'
-        ).count()
+        # Stats only move when this hospital's requests or the donor pool
+        # change (or the month rolls over)
+        this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        etag = compute_etag(
+            'hospital_stats', hospital.id, this_month.date(),
+            *queryset_state(BloodRequest.objects.filter(hospital=hospital)),
+            *queryset_state(Donor.objects.filter(is_verified=True, is_available=True))
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
         
-        rejected_requests = BloodRequest.objects.filter(
-            hospital=hospital, 
-            status='rejected'
-        ).count()
+        # Totals per status in a single aggregate query
+        counts = BloodRequest.objects.filter(hospital=hospital).aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='pending')),
+            approved=Count('id', filter=Q(status='approved')),
+            completed=Count('id', filter=Q(status='completed')),
+            rejected=Count('id', filter=Q(status='rejected')),
+            this_month=Count('id', filter=Q(created_at__gte=this_month)),
+        )
+        total_requests = counts['total']
+        pending_requests = counts['pending']
+        approved_requests = counts['approved']
+        completed_requests = counts['completed']
+        rejected_requests = counts['rejected']
         
         # Get available donors count (filter by location if needed)
         available_donors = Donor.objects.filter(
@@ -151,14 +215,9 @@ def hospital_stats(request):
         if total_processed > 0:
             success_rate = round((completed_requests / total_processed) * 100)
         
-        # Get this month's requests
-        this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month_requests = BloodRequest.objects.filter(
-            hospital=hospital,
-            created_at__gte=this_month
-        ).count()
+        this_month_requests = counts['this_month']
         
-        return Response({
+        return with_etag(Response({
             'total_requests': total_requests,
             'pending_requests': pending_requests,
             'approved_requests': approved_requests,
@@ -167,7 +226,7 @@ def hospital_stats(request):
             'available_donors': available_donors,
             'success_rate': success_rate,
             'this_month_requests': this_month_requests,
-        })
+        }), etag)
         
     except HospitalStaff.DoesNotExist:
         return Response({'error': 'Hospital staff not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -183,16 +242,16 @@ def request_stats(request):
         if request.user.user_type != 'hospital_staff':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        hospital_staff = HospitalStaff.objects.get(user=request.user)
+        hospital_staff = get_hospital_staff(request.user)
         hospital = hospital_staff.hospital
         
         # Get counts by status
-        stats = {
-            'pending': BloodRequest.objects.filter(hospital=hospital, status='pending').count(),
-            'approved': BloodRequest.objects.filter(hospital=hospital, status='approved').count(),
-            'completed': BloodRequest.objects.filter(hospital=hospital, status='completed').count(),
-            'rejected': BloodRequest.objects.filter(hospital=hospital, status='rejected').count(),
-        }
+        stats = BloodRequest.objects.filter(hospital=hospital).aggregate(
+            pending=Count('id', filter=Q(status='pending')),
+            approved=Count('id', filter=Q(status='approved')),
+            completed=Count('id', filter=Q(status='completed')),
+            rejected=Count('id', filter=Q(status='rejected')),
+        )
         
         return Response(stats)
         
@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import City, CityAlias, State, StateAlias
+
+class StateAliasInline(admin.TabularInline):
+    model = StateAlias
+    extra = 1
+
+class CityAliasInline(admin.TabularInline):
+    model = CityAlias
+    extra = 1
+
+@admin.register(State)
+class StateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'country')
+    search_fields = ('name', 'aliases__alias')
+    inlines = (StateAliasInline,)
+
+@admin.register(City)
+class CityAdmin(admin.ModelAdmin):
+    list_display = ('name', 'state')
+    list_filter = ('state',)
+    search_fields = ('name', 'aliases__alias')
+    inlines = (CityAliasInline,)
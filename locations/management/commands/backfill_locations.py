@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import Hospital
+from blood_donation.cache import bump_version
+from donors.models import Donor
+from locations.matching import resolve
+from locations.models import City, normalize
+
+class Command(BaseCommand):
+    help = 'Match existing donor and hospital city/state text to City/State rows'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Create cities that are not known yet under their (known) state'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be matched'
+        )
+    
+    def handle(self, *args, **options):
+        models = ((Donor, 'donor'), (Hospital, 'hospital'))
+        if options['create_missing'] and not options['dry_run']:
+            # One transaction, so the rematch after location edits runs once
+            with transaction.atomic():
+                for model, _ in models:
+                    for city, state in model.objects.values_list('city', 'state').distinct().order_by():
+                        city_id, state_id = resolve(city, state)
+                        if city_id is None and state_id is not None and city.strip():
+                            City.objects.get_or_create(
+                                state_id=state_id, name_key=normalize(city),
+                                defaults={'name': ' '.join(city.split()).title()}
+                            )
+        
+        unmatched = set()
+        for model, cache_group in models:
+            matched = updated = 0
+            # One UPDATE per distinct spelling rather than one per row
+            pairs = model.objects.values_list('city', 'state').distinct().order_by()
+            for city, state in pairs:
+                city_id, state_id = resolve(city, state)
+                if city_id is None and state_id is not None and city.strip() \
+                        and options['create_missing'] and options['dry_run']:
+                    city_id = 'new'  # would be created
+                if city_id is None:
+                    unmatched.add((city, state))
+                else:
+                    matched += 1
+                
+                if options['dry_run']:
+                    continue
+                values = {'city_ref_id': city_id, 'state_ref_id': state_id}
+                if model is Donor:
+                    # update() skips auto_now
+                    values['updated_at'] = timezone.now()
+                updated += model.objects.filter(city=city, state=state).update(**values)
+            
+            if not options['dry_run']:
+                bump_version(cache_group)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {matched} of {len(pairs)} city/state spellings matched, {updated} rows updated")
+        
+        for city, state in sorted(unmatched)[:50]:
+            self.stdout.write(f"Unmatched: {city!r}, {state!r}")
+        if len(unmatched) > 50:
+            self.stdout.write(f"... and {len(unmatched) - 50} more")
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Location backfill {'checked' if options['dry_run'] else 'done'}; "
+            f"add aliases for unmatched spellings and re-run"
+        ))
@@ -0,0 +1,96 @@
+"""
+Mapping free-text city/state names to ``City``/``State`` rows.
+
+Donor and hospital addresses keep the strings users typed. On save (see
+``signals``), ``resolve()`` fills in ``city_ref``/``state_ref``, and
+matching and filtering compare those ids instead of running
+``iexact``/``icontains`` over the strings. Names are matched on their
+normalized key (case and spacing ignored) or on an alias. Without a known
+state, a city only matches if its name is unique.
+
+Results are kept in the versioned response cache under the 'location'
+group, so repeated lookups (imports, backfill) skip the database. Any
+change to the location tables bumps the group and re-resolves the rows
+that did not match before (``rematch_unresolved``).
+"""
+import logging
+from django.db.models import Q
+from django.utils import timezone
+from blood_donation.cache import bump_version, get_or_build, get_version
+from .models import City, State, normalize
+
+logger = logging.getLogger(__name__)
+
+
+def _match_state(state_key):
+    if not state_key:
+        return None
+    return (
+        State.objects.filter(name_key=state_key).values_list('id', flat=True).first()
+        or State.objects.filter(aliases__alias_key=state_key).values_list('id', flat=True).first()
+    )
+
+
+def _match_city(city_key, state_id):
+    if not city_key:
+        return None, None
+    cities = City.objects.filter(state_id=state_id) if state_id else City.objects.all()
+    for lookup in ({'name_key': city_key}, {'aliases__alias_key': city_key}):
+        matches = list(cities.filter(**lookup).values_list('id', 'state_id').distinct()[:2])
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            # Same name in several states and no state to tell them apart
+            return None, None
+    return None, None
+
+
+def _match(city_key, state_key):
+    state_id = _match_state(state_key)
+    city_id, city_state_id = _match_city(city_key, state_id)
+    return city_id, state_id or city_state_id
+
+
+def resolve(city, state):
+    """``(city_id, state_id)`` for free-text names; either may be None"""
+    params = {'city': normalize(city), 'state': normalize(state)}
+    ids, _ = get_or_build('location_match', ('location',), lambda: _match(params['city'], params['state']), params)
+    return tuple(ids)
+
+
+_rematched_at = None
+
+
+def rematch_unresolved():
+    """
+    Re-resolve donor and hospital rows with no city_ref or state_ref, e.g.
+    saved before a City or alias was added. Runs once per 'location'
+    version, however many location rows one transaction touched.
+    """
+    global _rematched_at
+    from accounts.models import Hospital
+    from donors.models import Donor
+    
+    version = get_version('location')
+    if version == _rematched_at:
+        return
+    _rematched_at = version
+    
+    try:
+        for model, cache_group in ((Donor, 'donor'), (Hospital, 'hospital')):
+            unresolved = model.objects.filter(Q(city_ref__isnull=True) | Q(state_ref__isnull=True))
+            updated = 0
+            for city, state in unresolved.values_list('city', 'state').distinct().order_by():
+                city_id, state_id = resolve(city, state)
+                if city_id is None and state_id is None:
+                    continue
+                values = {'city_ref_id': city_id, 'state_ref_id': state_id}
+                if model is Donor:
+                    # update() skips auto_now
+                    values['updated_at'] = timezone.now()
+                updated += unresolved.filter(city=city, state=state).update(**values)
+            if updated:
+                bump_version(cache_group)
+    except Exception as e:
+        # backfill_locations can catch up later; don't fail the location edit
+        logger.error(f"Location rematch error: {str(e)}")
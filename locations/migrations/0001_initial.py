@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='State',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_key', models.CharField(editable=False, max_length=100, unique=True)),
+                ('country', models.CharField(default='India', max_length=100)),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('name_key', models.CharField(db_index=True, editable=False, max_length=100)),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cities', to='locations.state')),
+            ],
+            options={
+                'verbose_name_plural': 'cities',
+                'ordering': ('name',),
+                'unique_together': {('state', 'name_key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StateAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100)),
+                ('alias_key', models.CharField(editable=False, max_length=100, unique=True)),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='locations.state')),
+            ],
+            options={
+                'verbose_name_plural': 'state aliases',
+            },
+        ),
+        migrations.CreateModel(
+            name='CityAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100)),
+                ('alias_key', models.CharField(db_index=True, editable=False, max_length=100)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='locations.city')),
+            ],
+            options={
+                'verbose_name_plural': 'city aliases',
+                'unique_together': {('city', 'alias_key')},
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+from django.db import migrations
+
+# State/UT -> aliases (ISO and vehicle registration codes, former names)
+STATES = {
+    'Andhra Pradesh': ['AP'],
+    'Arunachal Pradesh': ['AR'],
+    'Assam': ['AS'],
+    'Bihar': ['BR'],
+    'Chhattisgarh': ['CG', 'CT', 'Chattisgarh'],
+    'Goa': ['GA'],
+    'Gujarat': ['GJ'],
+    'Haryana': ['HR'],
+    'Himachal Pradesh': ['HP'],
+    'Jharkhand': ['JH'],
+    'Karnataka': ['KA'],
+    'Kerala': ['KL'],
+    'Madhya Pradesh': ['MP'],
+    'Maharashtra': ['MH'],
+    'Manipur': ['MN'],
+    'Meghalaya': ['ML'],
+    'Mizoram': ['MZ'],
+    'Nagaland': ['NL'],
+    'Odisha': ['OD', 'OR', 'Orissa'],
+    'Punjab': ['PB'],
+    'Rajasthan': ['RJ'],
+    'Sikkim': ['SK'],
+    'Tamil Nadu': ['TN'],
+    'Telangana': ['TS', 'TG'],
+    'Tripura': ['TR'],
+    'Uttar Pradesh': ['UP'],
+    'Uttarakhand': ['UK', 'UT', 'Uttaranchal'],
+    'West Bengal': ['WB'],
+    'Andaman and Nicobar Islands': ['AN'],
+    'Chandigarh': ['CH'],
+    'Dadra and Nagar Haveli and Daman and Diu': ['DH', 'DN', 'DD'],
+    'Delhi': ['DL', 'NCT of Delhi'],
+    'Jammu and Kashmir': ['JK', 'J&K'],
+    'Ladakh': ['LA'],
+    'Lakshadweep': ['LD'],
+    'Puducherry': ['PY', 'Pondicherry'],
+}
+
+# (city, state) -> aliases; other cities are added by backfill_locations
+CITIES = {
+    ('Mumbai', 'Maharashtra'): ['Bombay'],
+    ('Pune', 'Maharashtra'): ['Poona'],
+    ('Bengaluru', 'Karnataka'): ['Bangalore'],
+    ('Mysuru', 'Karnataka'): ['Mysore'],
+    ('Chennai', 'Tamil Nadu'): ['Madras'],
+    ('Kolkata', 'West Bengal'): ['Calcutta'],
+    ('New Delhi', 'Delhi'): [],
+    ('Hyderabad', 'Telangana'): [],
+    ('Gurugram', 'Haryana'): ['Gurgaon'],
+    ('Thiruvananthapuram', 'Kerala'): ['Trivandrum'],
+    ('Kochi', 'Kerala'): ['Cochin'],
+    ('Vadodara', 'Gujarat'): ['Baroda'],
+    ('Ahmedabad', 'Gujarat'): [],
+    ('Jaipur', 'Rajasthan'): [],
+    ('Lucknow', 'Uttar Pradesh'): [],
+    ('Prayagraj', 'Uttar Pradesh'): ['Allahabad'],
+    ('Puducherry', 'Puducherry'): ['Pondicherry'],
+}
+
+
+def normalize(name):
+    # Same as locations.models.normalize
+    return ' '.join(name.split()).casefold()
+
+
+def seed(apps, schema_editor):
+    State = apps.get_model('locations', 'State')
+    City = apps.get_model('locations', 'City')
+    StateAlias = apps.get_model('locations', 'StateAlias')
+    CityAlias = apps.get_model('locations', 'CityAlias')
+    
+    states = {}
+    for name, aliases in STATES.items():
+        states[name], _ = State.objects.get_or_create(name_key=normalize(name), defaults={'name': name})
+        for alias in aliases:
+            StateAlias.objects.get_or_create(alias_key=normalize(alias), defaults={'alias': alias, 'state': states[name]})
+    
+    for (name, state), aliases in CITIES.items():
+        city, _ = City.objects.get_or_create(state=states[state], name_key=normalize(name), defaults={'name': name})
+        for alias in aliases:
+            CityAlias.objects.get_or_create(city=city, alias_key=normalize(alias), defaults={'alias': alias})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+
+def normalize(name):
+    # Same as locations.models.normalize
+    return ' '.join((name or '').split()).casefold()
+
+
+def backfill(apps, schema_editor):
+    """
+    Fill city_ref/state_ref on existing donors and hospitals, with the
+    same rules as locations.matching.resolve (which can't be used here: it
+    needs the current models and the cache).
+    """
+    State = apps.get_model('locations', 'State')
+    City = apps.get_model('locations', 'City')
+    StateAlias = apps.get_model('locations', 'StateAlias')
+    CityAlias = apps.get_model('locations', 'CityAlias')
+
+    states = dict(StateAlias.objects.values_list('alias_key', 'state_id'))
+    states.update(State.objects.values_list('name_key', 'id'))
+    by_name, by_alias = {}, {}
+    for key, city_id, state_id in City.objects.values_list('name_key', 'id', 'state_id'):
+        by_name.setdefault(key, set()).add((city_id, state_id))
+    for key, city_id, state_id in CityAlias.objects.values_list('alias_key', 'city_id', 'city__state_id'):
+        by_alias.setdefault(key, set()).add((city_id, state_id))
+
+    def resolve(city, state):
+        state_id = states.get(normalize(state))
+        city_key = normalize(city)
+        for index in (by_name, by_alias):
+            matches = {match for match in index.get(city_key, ()) if not state_id or match[1] == state_id}
+            if len(matches) == 1:
+                city_id, city_state_id = matches.pop()
+                return city_id, state_id or city_state_id
+            if matches:
+                break
+        return None, state_id
+
+    for app_label, model_name in (('donors', 'Donor'), ('accounts', 'Hospital')):
+        model = apps.get_model(app_label, model_name)
+        # One UPDATE per distinct spelling rather than one per row
+        for city, state in model.objects.values_list('city', 'state').distinct().order_by():
+            city_id, state_id = resolve(city, state)
+            if city_id or state_id:
+                model.objects.filter(city=city, state=state).update(city_ref_id=city_id, state_ref_id=state_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_seed_india'),
+        ('donors', '0004_donor_city_ref_state_ref'),
+        ('accounts', '0003_hospital_city_ref_state_ref'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
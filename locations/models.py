@@ -0,0 +1,76 @@
+from django.db import models
+
+
+def normalize(name):
+    """'  Navi   MUMBAI ' -> 'navi mumbai': the lookup key for names and aliases"""
+    return ' '.join(str(name or '').split()).casefold()
+
+
+class State(models.Model):
+    name = models.CharField(max_length=100)
+    name_key = models.CharField(max_length=100, unique=True, editable=False)
+    country = models.CharField(max_length=100, default='India')
+
+    class Meta:
+        ordering = ('name',)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.name_key = normalize(self.name)
+        super().save(*args, **kwargs)
+
+
+class City(models.Model):
+    name = models.CharField(max_length=100)
+    # Indexed for prefix (LIKE 'x%') autocomplete
+    name_key = models.CharField(max_length=100, db_index=True, editable=False)
+    state = models.ForeignKey(State, on_delete=models.CASCADE, related_name='cities')
+
+    class Meta:
+        ordering = ('name',)
+        unique_together = ('state', 'name_key')
+        verbose_name_plural = 'cities'
+
+    def __str__(self):
+        return f"{self.name}, {self.state.name}"
+
+    def save(self, *args, **kwargs):
+        self.name_key = normalize(self.name)
+        super().save(*args, **kwargs)
+
+
+class StateAlias(models.Model):
+    """Other spellings and codes of a state, e.g. 'MH' or 'Orissa'"""
+    state = models.ForeignKey(State, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100)
+    alias_key = models.CharField(max_length=100, unique=True, editable=False)
+
+    class Meta:
+        verbose_name_plural = 'state aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.state.name}"
+
+    def save(self, *args, **kwargs):
+        self.alias_key = normalize(self.alias)
+        super().save(*args, **kwargs)
+
+
+class CityAlias(models.Model):
+    """Other spellings and former names of a city, e.g. 'Bombay'"""
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100)
+    alias_key = models.CharField(max_length=100, db_index=True, editable=False)
+
+    class Meta:
+        unique_together = ('city', 'alias_key')
+        verbose_name_plural = 'city aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.city.name}"
+
+    def save(self, *args, **kwargs):
+        self.alias_key = normalize(self.alias)
+        super().save(*args, **kwargs)
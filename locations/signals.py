@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from accounts.models import Hospital
+from blood_donation.cache import bump_version
+from donors.models import Donor
+from .matching import rematch_unresolved, resolve
+from .models import City, CityAlias, State, StateAlias
+
+
+@receiver([post_save, post_delete], sender=State)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=StateAlias)
+@receiver([post_save, post_delete], sender=CityAlias)
+def invalidate_location_cache(sender, **kwargs):
+    """
+    Location edits invalidate cached matches and autocomplete results, and
+    may resolve donor/hospital addresses that matched nothing before
+    """
+    bump_version('location')
+    transaction.on_commit(rematch_unresolved)
+
+
+@receiver(pre_save, sender=Donor)
+@receiver(pre_save, sender=Hospital)
+def match_location(sender, instance, update_fields=None, **kwargs):
+    """Keep city_ref/state_ref in step with the free-text city and state"""
+    if update_fields is not None and not {'city', 'state'} & set(update_fields):
+        return
+    instance.city_ref_id, instance.state_ref_id = resolve(instance.city, instance.state)
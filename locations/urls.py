@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('cities/', views.city_autocomplete, name='city-autocomplete'),  # /api/locations/cities/?q=
+    path('states/', views.state_autocomplete, name='state-autocomplete'),  # /api/locations/states/?q=
+]
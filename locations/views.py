@@ -0,0 +1,99 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from blood_donation.cache import get_or_build
+from .matching import resolve
+from .models import City, CityAlias, State, StateAlias, normalize
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 50
+
+
+def autocomplete_params(request):
+    """Normalized ?q= prefix and ?limit= (default 10), or ValueError"""
+    prefix = normalize(request.GET.get('q'))
+    limit = int(request.GET.get('limit', 10))
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return prefix, min(limit, MAX_RESULTS)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def city_autocomplete(request):
+    """
+    Cities whose name or alias starts with ?q=, optionally within ?state=
+    (a name or code). Prefix lookups use the name_key/alias_key indexes.
+    """
+    try:
+        try:
+            prefix, limit = autocomplete_params(request)
+        except ValueError:
+            return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not prefix:
+            return Response({'count': 0, 'results': []})
+        
+        state_id = None
+        if request.GET.get('state'):
+            _, state_id = resolve('', request.GET['state'])
+            if state_id is None:
+                return Response({'count': 0, 'results': []})
+        
+        def build():
+            cities = City.objects.filter(name_key__startswith=prefix)
+            aliases = CityAlias.objects.filter(alias_key__startswith=prefix)
+            if state_id:
+                cities = cities.filter(state_id=state_id)
+                aliases = aliases.filter(city__state_id=state_id)
+            
+            results = {}
+            for city in cities.select_related('state').order_by('name_key')[:limit]:
+                results[city.id] = {'id': city.id, 'name': city.name, 'state': city.state.name, 'state_id': city.state_id}
+            for alias in aliases.select_related('city__state').order_by('alias_key')[:limit]:
+                city = alias.city
+                results.setdefault(city.id, {
+                    'id': city.id, 'name': city.name, 'state': city.state.name,
+                    'state_id': city.state_id, 'matched_alias': alias.alias
+                })
+            results = list(results.values())[:limit]
+            return {'count': len(results), 'results': results}
+        
+        data, hit = get_or_build('city_autocomplete', ('location',), build, {'q': prefix, 'state': state_id, 'limit': limit})
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+    except Exception as e:
+        logger.error(f"City autocomplete error: {str(e)}")
+        return Response({'error': 'Failed to fetch cities'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def state_autocomplete(request):
+    """States whose name or alias (e.g. 'MH') starts with ?q="""
+    try:
+        try:
+            prefix, limit = autocomplete_params(request)
+        except ValueError:
+            return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not prefix:
+            return Response({'count': 0, 'results': []})
+        
+        def build():
+            results = {}
+            for state in State.objects.filter(name_key__startswith=prefix).order_by('name_key')[:limit]:
+                results[state.id] = {'id': state.id, 'name': state.name, 'country': state.country}
+            for alias in StateAlias.objects.filter(alias_key__startswith=prefix).select_related('state').order_by('alias_key')[:limit]:
+                results.setdefault(alias.state_id, {
+                    'id': alias.state_id, 'name': alias.state.name,
+                    'country': alias.state.country, 'matched_alias': alias.alias
+                })
+            results = list(results.values())[:limit]
+            return {'count': len(results), 'results': results}
+        
+        data, hit = get_or_build('state_autocomplete', ('location',), build, {'q': prefix, 'limit': limit})
+        return Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+    except Exception as e:
+        logger.error(f"State autocomplete error: {str(e)}")
+        return Response({'error': 'Failed to fetch states'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LogEntry
+from .models import LogEntry, SlowQuery
 
 @admin.register(LogEntry)
 class LogEntryAdmin(admin.ModelAdmin):
@@ -16,4 +16,18 @@ class LogEntryAdmin(admin.ModelAdmin):
         return False  # Prevent log modification
     
     def has_delete_permission(self, request, obj=None):
-        return True  # Allow deletion for cleanup
\ No newline at end of file
+        return True  # Allow deletion for cleanup
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('captured_at', 'duration_ms', 'view_name', 'fingerprint')
+    list_filter = ('view_name', 'captured_at')
+    search_fields = ('fingerprint', 'request_path')
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+    list_per_page = 50
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
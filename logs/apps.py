@@ -10,4 +10,32 @@ from django.apps import AppConfig
 class LogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logs'
-    verbose_name = 'Logs'
\ No newline at end of file
+    verbose_name = 'Logs'
+
+    def ready(self):
+        from blood_donation.cache import get_stats
+        from .filters import DeduplicateFilter
+        from .handlers import BufferedDatabaseLogHandler
+        from . import metrics
+
+        metrics.register_gauge(
+            'db_log_queue_depth', 'Log records waiting to be written to the database',
+            lambda: sum(h.queue_depth for h in BufferedDatabaseLogHandler.instances)
+        )
+        metrics.register_gauge(
+            'db_log_records_dropped', 'Log records dropped because the queue was full',
+            lambda: sum(h.dropped for h in BufferedDatabaseLogHandler.instances)
+        )
+        metrics.register_gauge(
+            'log_records_suppressed', 'Repeated log records dropped by the dedup filter',
+            lambda: sum(f.suppressed for f in DeduplicateFilter.instances)
+        )
+        metrics.register_gauge(
+            'response_cache_hit_ratio', 'Response cache hit ratio per cached endpoint',
+            lambda: [({'endpoint': name}, stats['hit_rate']) for name, stats in get_stats().items()]
+        )
+        metrics.register_gauge(
+            'response_cache_lookups', 'Response cache lookups per cached endpoint',
+            lambda: [({'endpoint': name, 'result': result}, stats[result])
+                     for name, stats in get_stats().items() for result in ('hits', 'misses')]
+        )
@@ -0,0 +1,130 @@
+"""
+Streaming LogEntry export shared by the export endpoint and the
+``export_logs`` command. Rows are read with ``.iterator()`` and written
+one line at a time (optionally through an incremental gzip compressor), so
+memory stays flat however many rows match.
+
+Under ASGI Django reads a sync iterator passed to StreamingHttpResponse
+into a list before sending it, so the endpoint wraps the stream in
+``aiter_chunks`` there.
+"""
+import csv
+import itertools
+import json
+import zlib
+from asgiref.sync import sync_to_async
+from datetime import datetime, time as dt_time
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import LogEntry
+
+EXPORT_FIELDS = ('id', 'timestamp', 'level', 'message', 'module', 'user_id', 'ip_address', 'request_path')
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def _parse_moment(value, name, end_of_day=False):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"{name} must be an ISO date or datetime")
+        moment = datetime.combine(day, dt_time.max if end_of_day else dt_time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_log_entries(since=None, until=None, level=None, module=None, user_id=None):
+    """
+    LogEntry rows matching the export filters, oldest first. ``level`` may
+    be a comma separated list; a bare date for ``until`` includes that day.
+    Raises ValueError for unparseable values.
+    """
+    entries = LogEntry.objects.all()
+    if since:
+        entries = entries.filter(timestamp__gte=_parse_moment(since, 'since'))
+    if until:
+        entries = entries.filter(timestamp__lte=_parse_moment(until, 'until', end_of_day=True))
+    if level:
+        entries = entries.filter(level__in=[part.strip().upper() for part in level.split(',') if part.strip()])
+    if module:
+        entries = entries.filter(module=module)
+    if user_id not in (None, ''):
+        try:
+            entries = entries.filter(user_id=int(user_id))
+        except (TypeError, ValueError):
+            raise ValueError('user_id must be an integer')
+    return entries.order_by('id')
+
+
+def _rows(queryset):
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=2000)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer"""
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(queryset):
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def iter_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in _rows(queryset):
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value for value in row
+        )
+
+
+def iter_export(queryset, export_format):
+    return iter_csv(queryset) if export_format == 'csv' else iter_ndjson(queryset)
+
+
+def iter_gzip(chunks, flush_bytes=64 * 1024):
+    """gzip-compress a stream of text chunks on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    pending = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        pending += len(chunk)
+        if data:
+            yield data
+        # Push compressed output out regularly so clients see progress
+        if pending >= flush_bytes:
+            data = compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+            if data:
+                yield data
+    yield compressor.flush()
+
+
+async def aiter_chunks(chunks, batch_size=100):
+    """
+    Async iterator over a sync stream of chunks. Chunks are pulled in
+    batches on the thread sync code runs on under ASGI (which owns the
+    database cursor), so memory stays bounded by ``batch_size`` chunks.
+    """
+    iterator = iter(chunks)
+
+    def next_batch():
+        return list(itertools.islice(iterator, batch_size))
+
+    try:
+        while True:
+            batch = await sync_to_async(next_batch)()
+            if not batch:
+                break
+            for chunk in batch:
+                yield chunk
+    finally:
+        # Client went away or the stream ended: release the cursor
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
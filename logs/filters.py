@@ -0,0 +1,101 @@
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+
+_DIGITS = re.compile(r'\d+')
+
+
+class DeduplicateFilter(logging.Filter):
+    """
+    Rate-limits repeated messages.
+
+    Records are grouped by logger, level and message template: the format
+    string when the record has args, otherwise the message with numbers
+    masked and cut at the first ':' or ``key_length`` characters (so
+    " - Local donor: A in Pune" and " - Local donor: B in Pune" match).
+    The first ``burst`` records of a group in each ``window`` seconds pass;
+    later ones are dropped, except for a ``sample_rate`` share. Once the
+    window has passed, a "Suppressed N similar messages" record is logged
+    for the group the next time anything goes through the filter.
+
+    WARNING and above always pass. One instance can be shared by several
+    handlers; a record gets the same decision on each of them.
+    """
+    instances = weakref.WeakSet()
+
+    def __init__(self, window=60, burst=5, sample_rate=0.0, key_length=40, max_level='INFO'):
+        super().__init__()
+        self.window = float(window)
+        self.burst = int(burst)
+        self.sample_rate = float(sample_rate)
+        self.key_length = int(key_length)
+        self.max_level = logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+        self.groups = {}
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        DeduplicateFilter.instances.add(self)
+
+    def template(self, record):
+        if record.args:
+            return str(record.msg)
+        message = _DIGITS.sub('#', record.getMessage())
+        head, colon, _ = message[:self.key_length].partition(':')
+        return head + colon
+
+    def filter(self, record):
+        if getattr(record, 'dedup_summary', False) or record.levelno > self.max_level:
+            return True
+        decision = getattr(record, '_dedup_allowed', None)
+        if decision is not None:
+            return decision
+
+        now = time.monotonic()
+        key = (record.name, record.levelno, self.template(record))
+        with self._lock:
+            summaries = []
+            if now >= self._next_sweep:
+                summaries = self._expire(now)
+                self._next_sweep = now + min(self.window, 1.0)
+
+            group = self.groups.get(key)
+            if group is not None and now - group['start'] >= self.window:
+                if group['suppressed']:
+                    summaries.append(group)
+                group = None
+            if group is None:
+                group = self.groups[key] = {
+                    'start': now, 'seen': 0, 'suppressed': 0,
+                    'logger': record.name, 'level': record.levelno, 'example': record.getMessage(),
+                }
+
+            group['seen'] += 1
+            allowed = group['seen'] <= self.burst or (
+                self.sample_rate > 0 and random.random() < self.sample_rate
+            )
+            if not allowed:
+                group['suppressed'] += 1
+                self.suppressed += 1
+
+        record._dedup_allowed = allowed
+        for group in summaries:
+            self._log_summary(group)
+        return allowed
+
+    def _expire(self, now):
+        """Drop groups whose window is over, returning those with suppressed records"""
+        expired = [key for key, group in self.groups.items() if now - group['start'] >= self.window]
+        return [group for group in (self.groups.pop(key) for key in expired) if group['suppressed']]
+
+    def _log_summary(self, group):
+        logger = logging.getLogger(group['logger'])
+        record = logger.makeRecord(
+            logger.name, group['level'], __name__, 0,
+            f"Suppressed {group['suppressed']} similar messages in {self.window:g}s, e.g. {group['example'][:200]!r}",
+            None, None,
+        )
+        record.dedup_summary = True
+        logger.handle(record)
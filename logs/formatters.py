@@ -0,0 +1,23 @@
+import json
+import logging
+from datetime import datetime, timezone
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including the request context LoggingMiddleware attaches"""
+    CONTEXT_FIELDS = ('user_id', 'ip_address', 'request_path')
+    
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+        }
+        for field in self.CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
@@ -1,5 +1,15 @@
+import copy
+import gzip
 import logging
-from django.db import connection
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+import weakref
+from django.db import connection, close_old_connections
 
 class DatabaseLogHandler(logging.Handler):
     def emit(self, record):
@@ -24,5 +34,279 @@ class DatabaseLogHandler(logging.Handler):
                 request_path=request_path
             )
         except Exception as e:
-            # Fallback to console logging if database logging fails
-            print(f"Database logging failed: {e}")
\ No newline at end of file
+            # Fall back to stderr if database logging fails
+            print(f"Database logging failed: {e}", file=sys.stderr)
+
+
+class BufferedDatabaseLogHandler(logging.Handler):
+    """
+    Non-blocking variant of DatabaseLogHandler.
+
+    ``emit`` only formats the record and puts it on a bounded queue; a
+    background thread writes queued records with ``bulk_create`` whenever
+    ``batch_size`` records are waiting or ``flush_interval`` seconds have
+    passed. When the queue is full new records are dropped and counted in
+    ``dropped`` rather than blocking the request thread. ``flush()`` asks
+    the worker to write its current batch and everything queued before the
+    call, and waits up to ``flush_timeout`` seconds for it; ``close()``
+    (called by ``logging.shutdown`` at interpreter exit) flushes and stops
+    the worker.
+    """
+    instances = weakref.WeakSet()
+
+    def __init__(self, batch_size=100, flush_interval=2.0, max_queue=10000, flush_timeout=10.0,
+                 level=logging.NOTSET):
+        super().__init__(level)
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.flush_timeout = float(flush_timeout)
+        self.queue = queue.Queue(maxsize=int(max_queue))
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        BufferedDatabaseLogHandler.instances.add(self)
+
+    @property
+    def queue_depth(self):
+        return self.queue.qsize()
+
+    def _ensure_worker(self):
+        # Restart the worker after a fork (e.g. gunicorn --preload)
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='db-log-flusher', daemon=True
+            )
+            self._thread.start()
+
+    def emit(self, record):
+        # Records raised while flushing (e.g. DB errors) must not loop back
+        if threading.current_thread() is self._thread:
+            return
+        try:
+            entry = {
+                'level': record.levelname,
+                'message': self.format(record),
+                'module': record.module,
+                'user_id': getattr(record, 'user_id', None),
+                'ip_address': getattr(record, 'ip_address', None),
+                'request_path': getattr(record, 'request_path', '') or '',
+            }
+        except Exception:
+            self.handleError(record)
+            return
+
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self._ensure_worker()
+
+    def _drain(self):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                entry = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(entry, threading.Event):
+                # A flush request; this thread is writing everything anyway
+                entry.set()
+            else:
+                batch.append(entry)
+        return batch
+
+    def _write(self, batch):
+        if not batch:
+            return
+        from .models import LogEntry
+        with self._flush_lock:
+            try:
+                close_old_connections()
+                LogEntry.objects.bulk_create([LogEntry(**entry) for entry in batch])
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                # Fall back to stderr if database logging fails
+                print(f"Database logging failed for {len(batch)} records: {e}", file=sys.stderr)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while not self._stop.is_set():
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            flushed = None
+            try:
+                entry = self.queue.get(timeout=timeout)
+                if isinstance(entry, threading.Event):
+                    flushed = entry
+                else:
+                    batch.append(entry)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+            # Flush on request, on size or once the oldest queued record is flush_interval old
+            if flushed is not None or (batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline)):
+                self._write(batch)
+                batch = []
+                deadline = None
+            if flushed is not None:
+                flushed.set()
+        self._write(batch)
+        connection.close()
+
+    def _worker_running(self):
+        return (self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+                and threading.current_thread() is not self._thread)
+
+    def flush(self):
+        """Write everything queued so far, including the worker's current batch"""
+        if self._worker_running():
+            # Queued behind every earlier record, so once the worker sets
+            # it, those records (and its batch) are written
+            done = threading.Event()
+            try:
+                self.queue.put(done, timeout=self.flush_timeout)
+                if done.wait(self.flush_timeout):
+                    return
+            except queue.Full:
+                pass
+        self._flush_here()
+
+    def _flush_here(self):
+        """No (responsive) worker: write from the calling thread"""
+        while True:
+            batch = self._drain()
+            if not batch:
+                break
+            self._write(batch)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._stop.set()
+            if self._worker_running():
+                # Wake the worker so it sees _stop without waiting out its timeout
+                try:
+                    self.queue.put_nowait(threading.Event())
+                except queue.Full:
+                    pass
+                self._thread.join(timeout=self.flush_interval + 1)
+            if not self._worker_running():
+                self._flush_here()
+            super().close()
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as log_file, gzip.open(dest, 'wb') as archive:
+        shutil.copyfileobj(log_file, archive)
+    os.remove(source)
+
+
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener and never blocks"""
+    def __init__(self, queue, owner):
+        super().__init__(queue)
+        self.owner = owner
+
+    def prepare(self, record):
+        # Resolve the message now (args may change after the call returns)
+        # but leave formatting to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.owner.dropped += 1
+
+
+class AsyncRotatingFileHandler(logging.Handler):
+    """
+    File logging kept off the request thread.
+
+    ``emit`` hands the record to an internal ``QueueHandler`` that puts it
+    on a bounded queue; a ``QueueListener`` thread formats it and writes it
+    to a rotating file - by size (``max_bytes``), or by time when ``when``
+    is given (same values as ``TimedRotatingFileHandler``). Rotated files
+    are gzip-compressed unless ``compress`` is False. Records are dropped
+    (and counted) rather than blocking when the queue is full.
+
+    This is a plain ``Handler`` rather than a ``QueueHandler`` subclass:
+    ``dictConfig`` on Python 3.12+ configures QueueHandler subclasses in
+    its own way, which doesn't fit these arguments.
+    """
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=10, when=None,
+                 interval=1, compress=True, max_queue=10000, encoding='utf-8', level=logging.NOTSET):
+        super().__init__(level)
+        self.queue = queue.Queue(maxsize=int(max_queue))
+        self.queue_handler = _RecordQueueHandler(self.queue, self)
+        if when:
+            self.target = logging.handlers.TimedRotatingFileHandler(
+                filename, when=when, interval=int(interval), backupCount=int(backup_count),
+                encoding=encoding, delay=True
+            )
+        else:
+            self.target = logging.handlers.RotatingFileHandler(
+                filename, maxBytes=int(max_bytes), backupCount=int(backup_count),
+                encoding=encoding, delay=True
+            )
+        if compress:
+            self.target.namer = _gzip_namer
+            self.target.rotator = _gzip_rotator
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, in the file handler
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def _ensure_listener(self):
+        # Restart the listener after a fork (e.g. gunicorn --preload)
+        if self.listener is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self.listener is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.listener = logging.handlers.QueueListener(self.queue, self.target)
+            self.listener.start()
+
+    def emit(self, record):
+        self._ensure_listener()
+        # Level and filters were applied by this handler already
+        self.queue_handler.emit(record)
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+        self.queue_handler.close()
+        self.target.close()
+        super().close()
@@ -0,0 +1,78 @@
+import logging
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.test import Client
+from logs.handlers import DatabaseLogHandler, BufferedDatabaseLogHandler
+from logs.models import LogEntry
+
+class Command(BaseCommand):
+    help = ('Compare request latency with no DB logging, synchronous DB logging and buffered DB logging, '
+            'each handler attached directly to the logs.middleware logger')
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Requests to issue per mode (default: 200)'
+        )
+        parser.add_argument(
+            '--path',
+            default='/api/auth/profile/',
+            help='Path to request; every request goes through LoggingMiddleware (default: /api/auth/profile/)'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the log entries written during the benchmark'
+        )
+    
+    def handle(self, *args, **options):
+        modes = [
+            ('no db logging', None),
+            ('sync DatabaseLogHandler', DatabaseLogHandler()),
+            ('BufferedDatabaseLogHandler', BufferedDatabaseLogHandler(flush_interval=0.5)),
+        ]
+        
+        # LoggingMiddleware logs through this logger on every request. LOGGING
+        # doesn't route it to the 'db' handler, so this measures what each
+        # handler would cost on that path, not what production does today.
+        request_logger = logging.getLogger('logs.middleware')
+        original_level = request_logger.level
+        request_logger.setLevel(logging.INFO)
+        
+        client = Client(HTTP_HOST='localhost')
+        last_id = LogEntry.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        
+        try:
+            client.get(options['path'])  # warm up URL resolving, connections...
+            
+            for label, handler in modes:
+                if handler:
+                    request_logger.addHandler(handler)
+                try:
+                    timings = []
+                    for _ in range(options['requests']):
+                        start = time.perf_counter()
+                        client.get(options['path'])
+                        timings.append((time.perf_counter() - start) * 1000)
+                finally:
+                    if handler:
+                        request_logger.removeHandler(handler)
+                        handler.close()
+                
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                self.stdout.write(
+                    f"{label:<30} mean={statistics.mean(timings):.2f}ms "
+                    f"p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms"
+                )
+                if isinstance(handler, BufferedDatabaseLogHandler):
+                    self.stdout.write(f"{'':<30} written={handler.written} dropped={handler.dropped}")
+        finally:
+            request_logger.setLevel(original_level)
+            if not options['keep']:
+                LogEntry.objects.filter(id__gt=last_id).delete()
+        
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete"))
@@ -1,10 +1,18 @@
-from django.core.management.base import BaseCommand
+import gzip
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Min, Max
 from django.utils import timezone
 from datetime import timedelta
 from logs.models import LogEntry
 
+ARCHIVE_FIELDS = ('id', 'timestamp', 'level', 'message', 'module', 'user_id', 'ip_address', 'request_path')
+
 class Command(BaseCommand):
-    help = 'Clean up old log entries'
+    help = 'Clean up old log entries in bounded chunks, optionally archiving each day to NDJSON.gz first'
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -13,13 +21,95 @@ class Command(BaseCommand):
             default=90,
             help='Delete logs older than this many days (default: 90)'
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Maximum primary-key span deleted per transaction (default: 5000)'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Seconds to pause between chunks so other writers get the table (default: 0.1)'
+        )
+        parser.add_argument(
+            '--archive-dir',
+            help='Write each day of old logs to <dir>/logentry-YYYY-MM-DD-<first id>-<last id>.ndjson.gz before deleting it'
+        )
     
     def handle(self, *args, **options):
         days = options['days']
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
         cutoff_date = timezone.now() - timedelta(days=days)
+        old_logs = LogEntry.objects.filter(timestamp__lt=cutoff_date)
         
-        deleted_count, _ = LogEntry.objects.filter(timestamp__lt=cutoff_date).delete()
+        if options['archive_dir']:
+            os.makedirs(options['archive_dir'], exist_ok=True)
+            deleted_count = self.archive_by_day(old_logs, cutoff_date, options)
+        else:
+            deleted_count = self.delete_in_chunks(old_logs, options)
         
         self.stdout.write(
             self.style.SUCCESS(f"✅ Deleted {deleted_count} log entries older than {days} days")
-        )
\ No newline at end of file
+        )
+    
+    def delete_in_chunks(self, queryset, options):
+        """
+        Delete ``queryset`` one primary-key range at a time. Each chunk is its
+        own short transaction, so an interrupted run can simply be restarted.
+        """
+        chunk_size = options['chunk_size']
+        total = 0
+        lower = queryset.aggregate(first=Min('id'))['first']
+        while lower is not None:
+            upper = lower + chunk_size
+            deleted, _ = queryset.filter(id__gte=lower, id__lt=upper).delete()
+            total += deleted
+            self.stdout.write(f"  deleted {deleted} entries with id {lower}-{upper - 1} ({total} so far)")
+            
+            # Jump over gaps in the id sequence instead of scanning empty ranges
+            lower = queryset.filter(id__gte=upper).aggregate(first=Min('id'))['first']
+            if lower is not None and options['sleep']:
+                time.sleep(options['sleep'])
+        return total
+    
+    def archive_by_day(self, queryset, cutoff_date, options):
+        total = 0
+        oldest = queryset.aggregate(oldest=Min('timestamp'))['oldest']
+        if oldest is None:
+            return total
+        
+        day_start = oldest.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day_start < cutoff_date:
+            day_end = min(day_start + timedelta(days=1), cutoff_date)
+            day_logs = queryset.filter(timestamp__gte=day_start, timestamp__lt=day_end)
+            
+            bounds = day_logs.aggregate(first=Min('id'), last=Max('id'))
+            if bounds['first'] is not None:
+                path = os.path.join(
+                    options['archive_dir'],
+                    f"logentry-{day_start:%Y-%m-%d}-{bounds['first']}-{bounds['last']}.ndjson.gz"
+                )
+                archived = self.write_archive(
+                    day_logs.filter(id__lte=bounds['last']), path
+                )
+                self.stdout.write(f"📦 Archived {archived} entries from {day_start:%Y-%m-%d} to {path}")
+                
+                # Only rows that made it into the archive file are deleted
+                total += self.delete_in_chunks(day_logs.filter(id__lte=bounds['last']), options)
+            
+            day_start += timedelta(days=1)
+        return total
+    
+    def write_archive(self, queryset, path):
+        """Stream rows to a gzip NDJSON file, renamed into place once complete"""
+        tmp_path = f"{path}.tmp"
+        count = 0
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as archive:
+            for row in queryset.order_by('id').values(*ARCHIVE_FIELDS).iterator(chunk_size=2000):
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                count += 1
+        os.replace(tmp_path, path)
+        return count
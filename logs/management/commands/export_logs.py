@@ -0,0 +1,56 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from logs.export import FORMATS, filter_log_entries, iter_export, iter_gzip
+
+class Command(BaseCommand):
+    help = 'Stream filtered log entries as NDJSON or CSV to a file or stdout'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only entries at or after this ISO date/datetime')
+        parser.add_argument('--until', help='Only entries up to this ISO date/datetime (a date includes the whole day)')
+        parser.add_argument('--level', help='Comma separated levels, e.g. WARNING,ERROR')
+        parser.add_argument('--module', help='Only entries from this module')
+        parser.add_argument('--user-id', help='Only entries for this user id')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='ndjson',
+            help='Output format (default: ndjson)'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='gzip-compress the output'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write to this file instead of stdout'
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            entries = filter_log_entries(
+                since=options['since'],
+                until=options['until'],
+                level=options['level'],
+                module=options['module'],
+                user_id=options['user_id'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        chunks = iter_export(entries, options['format'])
+        if options['gzip']:
+            if not options['output']:
+                raise CommandError('--gzip needs --output')
+            with open(options['output'], 'wb') as output:
+                for data in iter_gzip(chunks):
+                    output.write(data)
+        elif options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
+            return
+        
+        self.stdout.write(self.style.SUCCESS(f"✅ Exported log entries to {options['output']}"), ending='\n')
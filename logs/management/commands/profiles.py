@@ -0,0 +1,65 @@
+import io
+import os
+import pstats
+from django.core.management.base import BaseCommand, CommandError
+from logs.profiling import list_profiles, profile_dir, profile_path
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls', 'filename')
+
+class Command(BaseCommand):
+    help = 'List captured request profiles, or summarize one by id'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profile_id',
+            nargs='?',
+            help='Profile to summarize (as returned in the X-Profile-Id header)'
+        )
+        parser.add_argument(
+            '--sort',
+            choices=SORT_KEYS,
+            default='cumulative',
+            help='Order functions by this pstats key (default: cumulative)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help='Number of functions (or profiles when listing) to show (default: 25)'
+        )
+        parser.add_argument(
+            '--endpoint',
+            help='Only list profiles of this URL name'
+        )
+    
+    def handle(self, *args, **options):
+        if options['profile_id']:
+            self.summarize(options['profile_id'], options['sort'], options['limit'])
+        else:
+            self.list(options['endpoint'], options['limit'])
+    
+    def list(self, endpoint, limit):
+        profiles = list_profiles()
+        if endpoint:
+            profiles = [meta for meta in profiles if meta.get('endpoint') == endpoint]
+        if not profiles:
+            self.stdout.write(f"No profiles in {profile_dir()}")
+            return
+        
+        for meta in profiles[:limit]:
+            self.stdout.write(
+                f"{meta['id']}  {meta['captured_at'][:19]}  {meta['duration_ms']:>9.2f}ms  "
+                f"{meta['status']}  {meta['method']} {meta['path']}"
+            )
+        self.stdout.write(f"{len(profiles)} profile(s) in {profile_dir()}")
+    
+    def summarize(self, profile_id, sort, limit):
+        path = profile_path(profile_id)
+        if not os.path.exists(path):
+            raise CommandError(f"No profile {profile_id} in {profile_dir()}")
+        
+        output = io.StringIO()
+        stats = pstats.Stats(path, stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        self.stdout.write(output.getvalue())
+        self.stdout.write(f"Full profile: {path} (open with snakeviz or flameprof for a flamegraph)")
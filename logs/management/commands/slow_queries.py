@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Max, Sum
+from django.utils import timezone
+from datetime import timedelta
+from logs.models import SlowQuery
+
+class Command(BaseCommand):
+    help = 'Report captured slow queries grouped by statement shape'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Number of statement shapes to show (default: 10)'
+        )
+        parser.add_argument(
+            '--hours',
+            type=int,
+            help='Only include queries captured in the last N hours'
+        )
+        parser.add_argument(
+            '--order-by',
+            choices=('total', 'max', 'count'),
+            default='total',
+            help='Rank shapes by total time, slowest run or occurrences (default: total)'
+        )
+        parser.add_argument(
+            '--plans',
+            action='store_true',
+            help='Print the EXPLAIN plan of the slowest run of each shape'
+        )
+    
+    def handle(self, *args, **options):
+        queries = SlowQuery.objects.all()
+        if options['hours']:
+            queries = queries.filter(captured_at__gte=timezone.now() - timedelta(hours=options['hours']))
+        
+        order = {'total': '-total_ms', 'max': '-max_ms', 'count': '-runs'}[options['order_by']]
+        groups = queries.values('fingerprint_hash').annotate(
+            runs=Count('id'),
+            total_ms=Sum('duration_ms'),
+            avg_ms=Avg('duration_ms'),
+            max_ms=Max('duration_ms'),
+            last_seen=Max('captured_at'),
+        ).order_by(order)[:options['top']]
+        
+        if not groups:
+            self.stdout.write('No slow queries captured')
+            return
+        
+        for rank, group in enumerate(groups, start=1):
+            slowest = queries.filter(
+                fingerprint_hash=group['fingerprint_hash']
+            ).order_by('-duration_ms').first()
+            views = sorted(set(queries.filter(
+                fingerprint_hash=group['fingerprint_hash']
+            ).exclude(view_name='').values_list('view_name', flat=True)[:50]))
+            
+            self.stdout.write(self.style.WARNING(
+                f"#{rank}  {group['runs']} runs  total {group['total_ms']:.0f}ms  "
+                f"avg {group['avg_ms']:.0f}ms  max {group['max_ms']:.0f}ms  "
+                f"last {group['last_seen']:%Y-%m-%d %H:%M}"
+            ))
+            self.stdout.write(f"    views: {', '.join(views) or '-'}")
+            self.stdout.write(f"    {slowest.fingerprint[:500]}")
+            if options['plans'] and slowest.plan:
+                for line in slowest.plan.splitlines():
+                    self.stdout.write(f"      {line}")
@@ -0,0 +1,138 @@
+"""
+In-process request metrics rendered in the Prometheus text format.
+
+``LoggingMiddleware`` records wall time, DB query count/time and response
+size per resolved URL name. Other modules can add point-in-time values
+(queue depths, cache hit rates...) with ``register_gauge``. Everything lives
+in the memory of the worker process, so scrape each worker (or run a single
+worker) to get complete numbers.
+"""
+import threading
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_gauges = {}
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, labels, value):
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series['counts'][index] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(key, le=_number(bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(key, le='+Inf')} {series['count']}")
+            lines.append(f"{self.name}_sum{_labels(key)} {_number(series['sum'])}")
+            lines.append(f"{self.name}_count{_labels(key)} {series['count']}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(key, **extra):
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def observe(name, help_text, buckets, labels, value):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram(name, help_text, buckets)
+        histogram.observe(labels, value)
+
+
+def increment(name, help_text, labels, amount=1):
+    with _lock:
+        counter = _counters.setdefault(name, {'help': help_text, 'series': {}})
+        key = tuple(sorted(labels.items()))
+        counter['series'][key] = counter['series'].get(key, 0) + amount
+
+
+def register_gauge(name, help_text, collect):
+    """
+    ``collect()`` is called at scrape time and returns a number, or a list
+    of ``(labels_dict, number)`` pairs
+    """
+    with _lock:
+        _gauges[name] = (help_text, collect)
+
+
+def observe_request(endpoint, method, status_code, duration, query_count, query_time, size):
+    labels = {'endpoint': endpoint, 'method': method}
+    increment('http_requests_total', 'Requests handled', {**labels, 'status': status_code})
+    observe('http_request_duration_seconds', 'Wall time spent handling the request',
+            DURATION_BUCKETS, labels, duration)
+    observe('http_request_db_queries', 'Database queries executed per request',
+            QUERY_COUNT_BUCKETS, labels, query_count)
+    observe('http_request_db_seconds', 'Time spent in database queries per request',
+            DURATION_BUCKETS, labels, query_time)
+    if size is not None:
+        observe('http_response_size_bytes', 'Response body size',
+                SIZE_BUCKETS, labels, size)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    with _lock:
+        lines = []
+        for name, counter in sorted(_counters.items()):
+            lines.append(f"# HELP {name} {counter['help']}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(counter['series'].items()):
+                lines.append(f"{name}{_labels(key)} {value}")
+        for histogram in sorted(_histograms.values(), key=lambda h: h.name):
+            lines.extend(histogram.render())
+        gauges = sorted(_gauges.items())
+
+    for name, (help_text, collect) in gauges:
+        try:
+            value = collect()
+        except Exception:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        if isinstance(value, (list, tuple)):
+            for labels, sample in value:
+                lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {_number(sample)}")
+        else:
+            lines.append(f"{name} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
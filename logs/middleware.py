@@ -1,10 +1,32 @@
 import logging
+import time
+from django.db import connection
 from django.utils.deprecation import MiddlewareMixin
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
+class QueryStats:
+    """DB execute wrapper counting queries and the time spent in them"""
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
 class LoggingMiddleware(MiddlewareMixin):
     def process_request(self, request):
+        request._metrics_start = time.perf_counter()
+        request._query_stats = QueryStats()
+        request._query_wrapper = connection.execute_wrapper(request._query_stats)
+        request._query_wrapper.__enter__()
+        
         # Add basic request info to logger context
         request.info = {
             'user_id': request.user.id if request.user.is_authenticated else None,
@@ -13,7 +35,8 @@ class LoggingMiddleware(MiddlewareMixin):
         }
         return None
 
-    def get_client_ip(self, request):
+    @staticmethod
+    def get_client_ip(request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
             ip = x_forwarded_for.split(',')[0]
@@ -21,16 +44,35 @@ class LoggingMiddleware(MiddlewareMixin):
             ip = request.META.get('REMOTE_ADDR')
         return ip
     
+    def record_metrics(self, request, response):
+        if not hasattr(request, '_metrics_start'):
+            return None
+        request._query_wrapper.__exit__(None, None, None)
+        duration = time.perf_counter() - request._metrics_start
+        
+        match = getattr(request, 'resolver_match', None)
+        endpoint = (match.view_name if match else None) or 'unresolved'
+        size = None if response.streaming else len(response.content)
+        stats = request._query_stats
+        metrics.observe_request(
+            endpoint, request.method, response.status_code,
+            duration, stats.count, stats.duration, size
+        )
+        return duration
+    
     def process_response(self, request, response):
+        duration = self.record_metrics(request, response)
+        
         # Log the request after it's processed
         if hasattr(request, 'info'):
             user_info = f"user_id:{request.info['user_id']}" if request.info['user_id'] else "anonymous"
+            timing = f" - {duration * 1000:.1f}ms" if duration is not None else ""
             logger.info(
-                f"{request.method} {request.path} - {response.status_code} - {user_info}",
+                f"{request.method} {request.path} - {response.status_code} - {user_info}{timing}",
                 extra={
                     'user_id': request.info['user_id'],
                     'ip_address': request.info['ip_address'],
                     'request_path': request.info['request_path'],
                 }
             )
-        return response
\ No newline at end of file
+        return response
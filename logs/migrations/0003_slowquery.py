@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0002_logentry_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('duration_ms', models.FloatField()),
+                ('fingerprint_hash', models.CharField(db_index=True, max_length=40)),
+                ('fingerprint', models.TextField()),
+                ('sql', models.TextField()),
+                ('params_fingerprint', models.CharField(blank=True, max_length=40)),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('request_path', models.CharField(blank=True, max_length=500)),
+                ('plan', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Slow queries',
+                'ordering': ['-captured_at'],
+            },
+        ),
+    ]
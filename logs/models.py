@@ -9,7 +9,7 @@ class LogEntry(models.Model):
         ('DEBUG', 'Debug'),
     )
     
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
     level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
     message = models.TextField()
     module = models.CharField(max_length=100)
@@ -30,4 +30,23 @@ class LogEntry(models.Model):
         try:
             return User.objects.get(id=self.user_id)
         except User.DoesNotExist:
-            return None
\ No newline at end of file
+            return None
+
+class SlowQuery(models.Model):
+    """A statement that ran longer than SLOW_QUERY_THRESHOLD_MS (see logs/slow_queries.py)"""
+    captured_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    duration_ms = models.FloatField()
+    fingerprint_hash = models.CharField(max_length=40, db_index=True)
+    fingerprint = models.TextField()
+    sql = models.TextField()
+    params_fingerprint = models.CharField(max_length=40, blank=True)
+    view_name = models.CharField(max_length=200, blank=True)
+    request_path = models.CharField(max_length=500, blank=True)
+    plan = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['-captured_at']
+        verbose_name_plural = 'Slow queries'
+
+    def __str__(self):
+        return f"{self.captured_at} - {self.duration_ms:.0f}ms - {self.fingerprint[:100]}"
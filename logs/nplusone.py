@@ -0,0 +1,127 @@
+"""
+N+1 query detection.
+
+``QueryRecorder`` is a DB execute wrapper that fingerprints every statement
+(literals and IN-lists collapsed, so ``WHERE id = 1`` and ``WHERE id = 2``
+share a shape) and keeps the first Python stack that issued each shape.
+Any shape executed ``NPLUSONE_THRESHOLD`` times or more in one request is
+reported.
+
+``NPlusOneMiddleware`` runs it per request when ``NPLUSONE_ENABLED`` is on
+(defaults to DEBUG). Reports are logged as warnings; with ``NPLUSONE_STRICT``
+they raise ``NPlusOneError`` instead, so a test run fails on a new N+1.
+Outside requests (management commands, tests calling helpers directly) use
+the recorder as a context manager::
+
+    with QueryRecorder() as recorder:
+        send_hospital_status_email(blood_request, 'approved')
+    recorder.check()
+"""
+import logging
+import os
+import re
+import traceback
+from collections import Counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Middleware/wrappers of this app sit on every stack; they aren't the caller
+_INSTRUMENTATION = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('nplusone.py', 'middleware.py', 'profiling.py')
+}
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """Statement shape with literal values and IN-list lengths removed"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql.replace('%s', '?'))
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _caller_stack(limit):
+    """Innermost frames from project code, skipping Django/DRF/site-packages"""
+    root = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(root) and 'site-packages' not in frame.filename
+        and frame.filename not in _INSTRUMENTATION
+    ]
+    return traceback.format_list(frames[-limit:])
+
+
+class QueryRecorder:
+    def __init__(self, threshold=None, stack_depth=None):
+        self.threshold = threshold or getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+        self.stack_depth = stack_depth or getattr(settings, 'NPLUSONE_STACK_DEPTH', 6)
+        self.counts = Counter()
+        self.stacks = {}
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = fingerprint(sql)
+        self.counts[shape] += 1
+        if shape not in self.stacks:
+            self.stacks[shape] = _caller_stack(self.stack_depth)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+        self._wrapper = None
+
+    def offenders(self):
+        """``(count, shape, stack)`` for shapes at or above the threshold"""
+        return [
+            (count, shape, self.stacks[shape])
+            for shape, count in self.counts.most_common()
+            if count >= self.threshold
+        ]
+
+    def report(self, label=''):
+        lines = []
+        for count, shape, stack in self.offenders():
+            lines.append(f"Possible N+1{' in ' + label if label else ''}: {count}x {shape}")
+            lines.append('First issued from:\n' + ''.join(stack).rstrip())
+        return '\n'.join(lines)
+
+    def check(self, label='', strict=None):
+        """Log (or, when strict, raise) any repeated statement shapes"""
+        report = self.report(label)
+        if not report:
+            return
+        if strict is None:
+            strict = getattr(settings, 'NPLUSONE_STRICT', False)
+        if strict:
+            raise NPlusOneError(report)
+        logger.warning(report)
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_ENABLED', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        recorder.check(f"{request.method} {request.path}")
+        return response
@@ -0,0 +1,180 @@
+"""
+On-demand request profiling.
+
+A request is run under cProfile when either:
+
+- it carries ``X-Profile: 1`` and the caller is a blood bank manager (or
+  ``PROFILING_ALLOW_HEADER`` is on, e.g. in development), or
+- it is picked by the ``PROFILING_SAMPLE_RATE`` random sample.
+
+The pstats dump and a small JSON summary are written to ``PROFILING_DIR``
+under a generated profile id, which is returned in the ``X-Profile-Id``
+header. ``.prof`` files load in snakeviz/flameprof/gprof2dot for
+flamegraphs; ``manage.py profiles`` lists and summarizes them.
+
+Under ASGI a profiled request leaves the event loop: the rest of the chain
+runs through ``async_to_sync`` from a worker thread, so sync views (which
+asgiref runs in that same thread) are captured. Async views, i.e. the
+long-lived event stream, are never profiled.
+"""
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def profile_dir():
+    return str(getattr(settings, 'PROFILING_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def list_profiles():
+    """Summaries of stored profiles, newest first"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as meta_file:
+                profiles.append(json.load(meta_file))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda meta: meta.get('captured_at', ''), reverse=True)
+
+
+def profile_path(profile_id):
+    return os.path.join(profile_dir(), f"{profile_id}.prof")
+
+
+def _prune(directory, keep):
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith('.prof')),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in profiles[keep:]:
+        for suffix in ('.prof', '.json'):
+            try:
+                os.remove(entry.path[:-len('.prof')] + suffix)
+            except OSError:
+                pass
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not self.should_profile(request):
+            return self.get_response(request)
+        return self.profile(request, self.get_response)
+
+    async def __acall__(self, request):
+        # Cheap checks first, so unprofiled requests stay on the event loop
+        if not self.requested(request):
+            return await self.get_response(request)
+        return await sync_to_async(self._profile_async_chain)(request)
+
+    def _profile_async_chain(self, request):
+        get_response = async_to_sync(self.get_response)
+        if not self.should_profile(request):
+            return get_response(request)
+        return self.profile(request, get_response)
+
+    def profile(self, request, get_response):
+        profile_id = uuid.uuid4().hex
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        response = profiler.runcall(get_response, request)
+        duration = time.perf_counter() - start
+
+        try:
+            self.save(profile_id, profiler, request, response, duration)
+            response['X-Profile-Id'] = profile_id
+        except Exception as e:
+            logger.error(f"Failed to store profile {profile_id}: {str(e)}")
+        return response
+
+    def requested(self, request):
+        """
+        'sample', 'header' or None; decided once per request. Async views
+        (the event stream) are long-lived and never profiled.
+        """
+        if not hasattr(request, '_profile_reason'):
+            sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+            if sample_rate and random.random() < sample_rate:
+                reason = 'sample'
+            elif request.META.get('HTTP_X_PROFILE') == '1':
+                reason = 'header'
+            else:
+                reason = None
+            if reason and self.is_async_view(request):
+                reason = None
+            request._profile_reason = reason
+        return request._profile_reason
+
+    def should_profile(self, request):
+        reason = self.requested(request)
+        if reason != 'header':
+            return reason == 'sample'
+        if getattr(settings, 'PROFILING_ALLOW_HEADER', False):
+            return True
+        return self.is_manager(request)
+
+    @staticmethod
+    def is_async_view(request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return iscoroutinefunction(match.func)
+
+    def is_manager(self, request):
+        # Same authentication as the API: revoked tokens are refused and the
+        # user comes from the cached auth context
+        from accounts.authentication import CachedJWTAuthentication
+        try:
+            result = CachedJWTAuthentication().authenticate(request)
+        except Exception:
+            return False
+        return bool(result) and result[0].user_type == 'blood_bank_manager'
+
+    def save(self, profile_id, profiler, request, response, duration):
+        directory = profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(directory, f"{profile_id}.prof"))
+
+        match = getattr(request, 'resolver_match', None)
+        meta = {
+            'id': profile_id,
+            'captured_at': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'endpoint': match.view_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+        }
+        with open(os.path.join(directory, f"{profile_id}.json"), 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+
+        _prune(directory, getattr(settings, 'PROFILING_MAX_FILES', 200))
+        logger.info(f"Profiled {request.method} {request.path} in {meta['duration_ms']}ms as {profile_id}")
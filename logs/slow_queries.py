@@ -0,0 +1,128 @@
+"""
+Slow-query capture.
+
+``SlowQueryRecorder`` is a DB execute wrapper that times each statement and,
+for any over ``SLOW_QUERY_THRESHOLD_MS``, captures the statement shape (see
+``logs.nplusone.fingerprint``), a hash of the parameters, the calling view
+and an EXPLAIN plan taken straight away on the same connection. Captures
+are written to the ``SlowQuery`` table once the request is done, so they
+don't join (or roll back with) the request's transaction; the table is
+trimmed to the newest ``SLOW_QUERY_MAX_ROWS`` rows.
+
+``manage.py slow_queries --top 20`` reports them grouped by shape.
+"""
+import hashlib
+import logging
+import time
+from django.conf import settings
+from django.db import connection
+from django.utils.deprecation import MiddlewareMixin
+from .nplusone import fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(value):
+    return hashlib.sha1(value.encode('utf-8', 'replace')).hexdigest()
+
+
+def explain(sql, params):
+    """Execution plan for a SELECT on the default connection, as text"""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return ''
+
+    vendor = connection.vendor
+    try:
+        # The backend cursor bypasses execute wrappers, so the EXPLAIN is
+        # neither timed, captured nor counted by the N+1 detector
+        connection.ensure_connection()
+        cursor = connection.create_cursor()
+        try:
+            if vendor == 'microsoft':
+                cursor.execute('SET SHOWPLAN_TEXT ON')
+                try:
+                    cursor.execute(sql, params)
+                    rows = []
+                    while True:
+                        rows.extend(cursor.fetchall())
+                        if not cursor.nextset():
+                            break
+                finally:
+                    cursor.execute('SET SHOWPLAN_TEXT OFF')
+            elif vendor == 'sqlite':
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                rows = cursor.fetchall()
+            else:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        return '\n'.join(' | '.join(str(column) for column in row) for row in rows)
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+
+
+class SlowQueryRecorder:
+    def __init__(self, request=None, threshold_ms=None):
+        self.request = request
+        self.threshold_ms = threshold_ms or getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 500)
+        self.captured = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.capture(sql, params, many, duration_ms)
+
+    def capture(self, sql, params, many, duration_ms):
+        match = getattr(self.request, 'resolver_match', None)
+        shape = fingerprint(sql)
+        self.captured.append({
+            'duration_ms': round(duration_ms, 2),
+            'fingerprint_hash': _hash(shape),
+            'fingerprint': shape,
+            'sql': sql[:10000],
+            'params_fingerprint': _hash(repr(params)) if params else '',
+            'view_name': (match.view_name if match else '') or '',
+            'request_path': self.request.path[:500] if self.request is not None else '',
+            'plan': '' if many else explain(sql, params),
+        })
+
+    def save(self):
+        if not self.captured:
+            return
+        from .models import SlowQuery
+        try:
+            created = SlowQuery.objects.bulk_create([SlowQuery(**entry) for entry in self.captured])
+            max_rows = getattr(settings, 'SLOW_QUERY_MAX_ROWS', 10000)
+            newest_id = created[-1].id or SlowQuery.objects.order_by('-id').values_list('id', flat=True).first()
+            if newest_id and newest_id > max_rows:
+                SlowQuery.objects.filter(id__lte=newest_id - max_rows).delete()
+        except Exception as e:
+            logger.error(f"Failed to store slow queries: {str(e)}")
+        finally:
+            self.captured = []
+
+
+class SlowQueryMiddleware(MiddlewareMixin):
+    def process_request(self, request):
+        if getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 500) <= 0:
+            return None
+        request._slow_queries = SlowQueryRecorder(request)
+        request._slow_query_wrapper = connection.execute_wrapper(request._slow_queries)
+        request._slow_query_wrapper.__enter__()
+        return None
+
+    def process_response(self, request, response):
+        if hasattr(request, '_slow_queries'):
+            request._slow_query_wrapper.__exit__(None, None, None)
+            for entry in request._slow_queries.captured:
+                logger.warning(
+                    f"Slow query ({entry['duration_ms']}ms) in {entry['view_name'] or request.path}: "
+                    f"{entry['fingerprint'][:200]}"
+                )
+            request._slow_queries.save()
+        return response
@@ -0,0 +1,193 @@
+"""
+Lightweight tracing spans.
+
+``span(name, **attributes)`` is a context manager that times a block and
+records it as a child of the enclosing span (tracked in a contextvar, so
+it follows threads and async tasks the way logging context does). When
+the outermost span of a trace ends, the whole trace is handed to the
+``traces`` logger, whose queued rotating handler (see ``LOGGING``) writes
+it to ``TRACING_FILE`` off the request thread as NDJSON, one span per
+line, using OTLP/JSON field names (traceId, spanId, parentSpanId,
+startTimeUnixNano...), so the file can be shipped to an OpenTelemetry
+collector or read with ``jq``::
+
+    @traced('approve_request')
+    def approve_request(request, request_id):
+        current_span().set_attribute('request_id', request_id)
+        with span('match.same_city'):
+            ...
+
+Tracing is off unless ``TRACING_ENABLED``; then ``TRACING_SAMPLE_RATE``
+of traces are kept, decided once at the root span. A W3C ``traceparent``
+passed to the root span joins an upstream trace and follows its sampled
+flag.
+"""
+import contextvars
+import functools
+import json
+import logging
+import random
+import secrets
+import time
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger('traces')
+
+_current = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    def __init__(self, name, trace, parent=None, attributes=None):
+        self.name = name
+        self.trace = trace
+        self.trace_id = trace['trace_id']
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else trace.get('parent_id')
+        self.attributes = dict(attributes or {})
+        self.status = 'ok'
+        self.error = None
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc):
+        self.status = 'error'
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.trace['spans'].append(self)
+
+    def as_otlp(self):
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.start_ns + int(self.duration_ms * 1_000_000),
+            'durationMs': round(self.duration_ms, 3),
+            'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': 'STATUS_CODE_ERROR' if self.status == 'error' else 'STATUS_CODE_OK',
+                       'message': self.error or ''},
+            'service': getattr(settings, 'TRACING_SERVICE_NAME', 'blood-donation'),
+        }
+
+
+class _NullSpan:
+    """
+    Stands in when tracing is off or no span is active; also marks the
+    current context as part of a trace that wasn't sampled
+    """
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _parse_traceparent(header):
+    """'00-<trace id>-<parent id>-<flags>' -> (trace id, parent id, sampled)"""
+    parts = (header or '').split('-')
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+        try:
+            sampled = bool(int(parts[3], 16) & 1)
+        except ValueError:
+            sampled = None
+        return parts[1], parts[2], sampled
+    return None, None, None
+
+
+def _sample():
+    rate = getattr(settings, 'TRACING_SAMPLE_RATE', 1.0)
+    return rate >= 1 or random.random() < rate
+
+
+def enabled():
+    return getattr(settings, 'TRACING_ENABLED', False)
+
+
+def current_span():
+    return _current.get() or NULL_SPAN
+
+
+def export(trace):
+    # One record per trace; the handler adds the final newline
+    try:
+        trace_logger.info('\n'.join(json.dumps(s.as_otlp()) for s in trace['spans']))
+    except Exception as e:
+        logger.error(f"Failed to export trace {trace['trace_id']}: {str(e)}")
+
+
+class span:
+    def __init__(self, name, traceparent=None, **attributes):
+        self.name = name
+        self.traceparent = traceparent
+        self.attributes = attributes
+        self.span = None
+        self._token = None
+
+    def __enter__(self):
+        if not enabled():
+            return NULL_SPAN
+        parent = _current.get()
+        if parent is NULL_SPAN:
+            return NULL_SPAN
+        if parent is not None:
+            trace = parent.trace
+        else:
+            trace_id, parent_id, sampled = _parse_traceparent(self.traceparent)
+            if not (_sample() if sampled is None else sampled):
+                # Nested spans see NULL_SPAN and skip the trace too
+                self._token = _current.set(NULL_SPAN)
+                return NULL_SPAN
+            trace = {'trace_id': trace_id or secrets.token_hex(16), 'parent_id': parent_id, 'spans': []}
+        self.span = Span(self.name, trace, parent, self.attributes)
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is None:
+            if self._token is not None:
+                _current.reset(self._token)
+            return False
+        if exc is not None:
+            self.span.record_exception(exc)
+        self.span.finish()
+        _current.reset(self._token)
+        if _current.get() is None:
+            export(self.span.trace)
+        return False
+
+
+def traced(name, **attributes):
+    """
+    Decorator running the whole function inside ``span(name)``. For views
+    the request's ``traceparent`` header (if any) becomes the parent.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            headers = getattr(args[0], 'headers', None) if args else None
+            traceparent = headers.get('traceparent') if headers is not None else None
+            with span(name, traceparent=traceparent, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,3 +1,73 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+from . import metrics
+from .export import CONTENT_TYPES, FORMATS, aiter_chunks, filter_log_entries, iter_export, iter_gzip
+import logging
 
-# Create your views here.
+logger = logging.getLogger(__name__)
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint, limited to METRICS_ALLOWED_IPS or METRICS_TOKEN"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorized = token and request.META.get('HTTP_AUTHORIZATION') == f"Bearer {token}"
+    # REMOTE_ADDR, not X-Forwarded-For: the header is client-controlled
+    client_ip = request.META.get('REMOTE_ADDR')
+    if not authorized and client_ip not in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return HttpResponseForbidden('Forbidden')
+    
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_logs(request):
+    """
+    Stream LogEntry rows as NDJSON (default) or CSV (?output=csv; DRF keeps
+    ?format= for itself). Filters: since, until, level, module, user_id;
+    gzip=true compresses on the fly.
+    """
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        export_format = request.GET.get('output', 'ndjson')
+        if export_format not in FORMATS:
+            return Response({'error': f"output must be one of: {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            entries = filter_log_entries(
+                since=request.GET.get('since'),
+                until=request.GET.get('until'),
+                level=request.GET.get('level'),
+                module=request.GET.get('module'),
+                user_id=request.GET.get('user_id'),
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        filename = f"logentries-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+        chunks = iter_export(entries, export_format)
+        gzipped = request.GET.get('gzip', '').lower() in ('1', 'true')
+        if gzipped:
+            chunks = iter_gzip(chunks)
+            filename += '.gz'
+        if isinstance(request._request, ASGIRequest):
+            # ASGI would buffer a sync iterator in full
+            chunks = aiter_chunks(chunks)
+        content_type = 'application/gzip' if gzipped else f"{CONTENT_TYPES[export_format]}; charset=utf-8"
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        
+        logger.info(f"Log export ({export_format}) started by {request.user.username}")
+        return response
+    except Exception as e:
+        logger.error(f"Log export error: {str(e)}")
+        return Response({'error': 'Failed to export logs'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class RequestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'requests'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from logs import metrics
+        from .email_utils import EmailQueue
+
+        metrics.register_gauge(
+            'email_queue_depth', 'Emails queued by bulk actions and not yet sent',
+            lambda: sum(queue.depth for queue in EmailQueue.instances)
+        )
@@ -0,0 +1,84 @@
+"""
+Hot/cold archival of closed blood requests.
+
+``BloodRequest``, ``DonorNotification`` and ``DonationRecord`` only need
+open and recently closed rows; the pending/approved queries and their
+indexes stay small if everything else moves out. ``archive_closed_requests``
+(run by ``manage.py archive_requests``) copies completed, rejected and
+cancelled requests last updated more than N days ago, together with their
+notifications and donation records, into the ``Archived*`` tables. It then
+deletes them from the hot tables, one transaction per chunk. Merge records
+of archived requests (``MergedBloodRequest``) are dropped with them; the
+duplicates report only looks at recent merges.
+
+Read APIs include archived rows only when asked with ``?include_archived=true``.
+"""
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import (
+    ArchivedBloodRequest, ArchivedDonationRecord, ArchivedDonorNotification,
+    BloodRequest, DonationRecord, DonorNotification,
+)
+
+CLOSED_STATUSES = ('completed', 'rejected', 'cancelled')
+
+
+def wants_archived(request):
+    return request.GET.get('include_archived', '').lower() in ('1', 'true')
+
+
+def archive_copy(instance, archive_model):
+    """Unsaved archive row with the same field values (and id) as ``instance``"""
+    return archive_model(**{
+        field.attname: getattr(instance, field.attname)
+        for field in archive_model._meta.concrete_fields
+        if field.attname != 'archived_at'
+    })
+
+
+def archivable_requests(days):
+    return BloodRequest.objects.filter(
+        status__in=CLOSED_STATUSES,
+        updated_at__lt=timezone.now() - timedelta(days=days),
+    )
+
+
+def archive_chunk(request_ids):
+    """Move one chunk of requests and their children; returns row counts"""
+    with transaction.atomic():
+        blood_requests = list(
+            BloodRequest.objects.select_for_update().filter(id__in=request_ids, status__in=CLOSED_STATUSES)
+        )
+        request_ids = [blood_request.id for blood_request in blood_requests]
+        notifications = list(DonorNotification.objects.filter(blood_request_id__in=request_ids))
+        donations = list(DonationRecord.objects.filter(blood_request_id__in=request_ids))
+        
+        ArchivedBloodRequest.objects.bulk_create(
+            [archive_copy(blood_request, ArchivedBloodRequest) for blood_request in blood_requests]
+        )
+        ArchivedDonorNotification.objects.bulk_create(
+            [archive_copy(notification, ArchivedDonorNotification) for notification in notifications], batch_size=1000
+        )
+        ArchivedDonationRecord.objects.bulk_create(
+            [archive_copy(donation, ArchivedDonationRecord) for donation in donations], batch_size=1000
+        )
+        
+        DonationRecord.objects.filter(blood_request_id__in=request_ids).delete()
+        DonorNotification.objects.filter(blood_request_id__in=request_ids).delete()
+        BloodRequest.objects.filter(id__in=request_ids).delete()
+    
+    return {'requests': len(blood_requests), 'notifications': len(notifications), 'donations': len(donations)}
+
+
+def archive_closed_requests(days, chunk_size=500):
+    """Archive everything closed more than ``days`` ago; yields per-chunk counts"""
+    last_id = 0
+    while True:
+        request_ids = list(
+            archivable_requests(days).filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not request_ids:
+            return
+        last_id = request_ids[-1]
+        yield archive_chunk(request_ids)
@@ -0,0 +1,79 @@
+"""
+Duplicate blood-request detection.
+
+``create_blood_request`` looks up the normalized fingerprint of a new
+request (see ``blood_request_fingerprint``) among the hospital's open
+requests from the last ``DUPLICATE_REQUEST_WINDOW_HOURS``. That is a
+single lookup on the (fingerprint, created_at) index. What happens to a
+match depends on ``DUPLICATE_REQUEST_POLICY``:
+
+- ``merge`` (default): no new request is created. The open one keeps the
+  larger unit count and the higher urgency, and a ``MergedBloodRequest``
+  row records the duplicate for the managers' report.
+- ``reject``: the submission is refused with 409 and the open request's id.
+
+The check and the create/merge run in one transaction holding a lock on
+the hospital row (``lock_hospital``), so two concurrent submissions (a
+double click) are handled one after the other: the second one sees the
+first one's request, and merges see each other's units and urgency.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from accounts.models import Hospital
+from .models import BloodRequest, MergedBloodRequest, blood_request_fingerprint
+
+OPEN_STATUSES = ('pending', 'approved')
+URGENCY_ORDER = ('low', 'medium', 'high', 'critical')
+
+
+def lock_hospital(hospital_id):
+    """Serialize request creation for one hospital until the transaction ends"""
+    Hospital.objects.select_for_update().only('id').get(pk=hospital_id)
+
+
+def find_duplicate(hospital_id, data, for_update=False):
+    """
+    The newest open request within the window matching ``data``, or None.
+    With ``for_update`` the match stays locked until the transaction ends.
+    """
+    window = getattr(settings, 'DUPLICATE_REQUEST_WINDOW_HOURS', 24)
+    if not window:
+        return None
+    fingerprint = blood_request_fingerprint(
+        hospital_id, data['patient_name'], data['patient_age'], data['blood_group'], data.get('operation_id', '')
+    )
+    candidates = BloodRequest.objects.filter(
+        fingerprint=fingerprint,
+        created_at__gte=timezone.now() - timedelta(hours=window),
+        status__in=OPEN_STATUSES,
+    ).order_by('-created_at')
+    if for_update:
+        candidates = candidates.select_for_update()
+    return candidates.first()
+
+
+def merge_duplicate(blood_request, data, user):
+    """
+    Fold a duplicate submission into ``blood_request``, which the caller
+    has locked (``find_duplicate(..., for_update=True)``)
+    """
+    units_required = data.get('units_required', 1)
+    urgency_level = data.get('urgency_level', blood_request.urgency_level)
+    
+    changed = []
+    if units_required > blood_request.units_required:
+        blood_request.units_required = units_required
+        changed.append('units_required')
+    if URGENCY_ORDER.index(urgency_level) > URGENCY_ORDER.index(blood_request.urgency_level):
+        blood_request.urgency_level = urgency_level
+        changed.append('urgency_level')
+    if changed:
+        blood_request.save(update_fields=changed + ['updated_at'])
+    
+    return MergedBloodRequest.objects.create(
+        blood_request=blood_request,
+        submitted_by=user,
+        units_required=units_required,
+        urgency_level=urgency_level,
+    )
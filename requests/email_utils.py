@@ -1,51 +1,89 @@
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
+from logs.tracing import span, traced, current_span
 import logging
+import weakref
+from contextlib import nullcontext
 
 logger = logging.getLogger(__name__)
 
+def build_donation_request_email(notification):
+    """
+    Build (without sending) the email to a donor about a new blood request
+    """
+    donor = notification.donor
+    blood_request = notification.blood_request
+    
+    subject = f"🩸 Blood Donation Request - {blood_request.patient_name} ({blood_request.blood_group})"
+    
+    context = {
+        'donor': donor,
+        'request': blood_request,
+        'portal_url': f"{settings.FRONTEND_URL}/donor/notifications" if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:3000/donor/notifications'
+    }
+    
+    # HTML content
+    html_content = render_to_string('emails/donation_request.html', context)
+    text_content = strip_tags(render_to_string('emails/donation_request.txt', context))
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[donor.user.email],
+        reply_to=[settings.REPLY_TO_EMAIL] if hasattr(settings, 'REPLY_TO_EMAIL') else None
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+def build_eligibility_reminder_email(donor, eligible_from):
+    """
+    Build (without sending) the "you can donate again" email for a donor
+    whose 3-month gap ends on ``eligible_from``
+    """
+    context = {
+        'donor': donor,
+        'eligible_from': eligible_from,
+        'portal_url': f"{settings.FRONTEND_URL}/donor/profile" if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:3000/donor/profile'
+    }
+    
+    html_content = render_to_string('emails/eligibility_reminder.html', context)
+    text_content = render_to_string('emails/eligibility_reminder.txt', context)
+    
+    email = EmailMultiAlternatives(
+        subject="🩸 You can donate blood again",
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[donor.user.email],
+        reply_to=[settings.REPLY_TO_EMAIL] if hasattr(settings, 'REPLY_TO_EMAIL') else None
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+@traced('email.donation_request')
 def send_donation_request_email(notification):
     """
     Send email to donor about a new blood request
     """
     try:
-        donor = notification.donor
-        blood_request = notification.blood_request
-        
-        subject = f"🩸 Blood Donation Request - {blood_request.patient_name} ({blood_request.blood_group})"
-        
-        context = {
-            'donor': donor,
-            'request': blood_request,
-            'portal_url': f"{settings.FRONTEND_URL}/donor/notifications" if hasattr(settings, 'FRONTEND_URL') else 'http://localhost:3000/donor/notifications'
-        }
-        
-        # HTML content
-        html_content = render_to_string('emails/donation_request.html', context)
-        text_content = strip_tags(render_to_string('emails/donation_request.txt', context))
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[donor.user.email],
-            reply_to=[settings.REPLY_TO_EMAIL] if hasattr(settings, 'REPLY_TO_EMAIL') else None
-        )
-        email.attach_alternative(html_content, "text/html")
+        email = build_donation_request_email(notification)
         
         # Send email
-        email.send(fail_silently=False)
+        with span('smtp.send', notification_id=notification.id):
+            email.send(fail_silently=False)
         
-        logger.info(f"Donation request email sent to {donor.user.email}")
+        logger.info(f"Donation request email sent to {notification.donor.user.email}")
         return True
         
     except Exception as e:
+        current_span().record_exception(e)
         logger.error(f"Failed to send donation request email: {str(e)}")
         return False
 
+@traced('email.request_fulfilled')
 def send_request_fulfilled_email(notification, accepted_donor):
     """
     Send email to other donors when a request is fulfilled
@@ -77,65 +115,84 @@ def send_request_fulfilled_email(notification, accepted_donor):
         email.attach_alternative(html_content, "text/html")
         
         # Send email
-        email.send(fail_silently=True)
+        with span('smtp.send', notification_id=notification.id):
+            email.send(fail_silently=True)
         
         logger.info(f"Request fulfilled email sent to {donor.user.email}")
         return True
         
     except Exception as e:
+        current_span().record_exception(e)
         logger.error(f"Failed to send request fulfilled email: {str(e)}")
         return False
 
-def send_hospital_status_email(blood_request, status, accepted_donor=None):
+def build_hospital_status_email(blood_request, status, accepted_donor=None, requested_donors_count=None, staff_emails=None):
     """
-    Send email to hospital about request status changes
+    Build (without sending) the status email to a hospital's staff, or None
+    if nobody has an email address. Batch callers pass the donor count and
+    staff emails they already looked up.
     """
-    try:
-        hospital = blood_request.hospital
-        
-        # Choose the right template based on status
-        if status == 'completed' and accepted_donor:
-            subject = f"✅ Blood Request Fulfilled - Donor Found for {blood_request.patient_name}"
-            html_template = 'emails/hospital_status_update.html'
-            text_template = 'emails/hospital_status_update.txt'
-        elif status == 'approved':
-            subject = f"✅ Blood Request Approved - {blood_request.patient_name}"
-            html_template = 'emails/hospital_request_approved.html'
-            text_template = 'emails/hospital_request_approved.txt'
-        else:
-            subject = f"Blood Request Update - {blood_request.patient_name}"
-            html_template = 'emails/hospital_status_update.html'
-            text_template = 'emails/hospital_status_update.txt'
-        
-        # Count requested donors for the approval email
+    hospital = blood_request.hospital
+    
+    # Choose the right template based on status
+    if status == 'completed' and accepted_donor:
+        subject = f"✅ Blood Request Fulfilled - Donor Found for {blood_request.patient_name}"
+        html_template = 'emails/hospital_status_update.html'
+        text_template = 'emails/hospital_status_update.txt'
+    elif status == 'approved':
+        subject = f"✅ Blood Request Approved - {blood_request.patient_name}"
+        html_template = 'emails/hospital_request_approved.html'
+        text_template = 'emails/hospital_request_approved.txt'
+    else:
+        subject = f"Blood Request Update - {blood_request.patient_name}"
+        html_template = 'emails/hospital_status_update.html'
+        text_template = 'emails/hospital_status_update.txt'
+    
+    # Count requested donors for the approval email
+    if requested_donors_count is None:
         from .models import DonorNotification
         requested_donors_count = DonorNotification.objects.filter(blood_request=blood_request).count()
-        
-        context = {
-            'request': blood_request,
-            'status': status,
-            'hospital': hospital,
-            'donor': accepted_donor,
-            'requested_donors_count': requested_donors_count
-        }
-        
-        # HTML content
-        html_content = render_to_string(html_template, context)
-        text_content = render_to_string(text_template, context)
-        
-        # Get hospital staff emails
+    
+    context = {
+        'request': blood_request,
+        'status': status,
+        'hospital': hospital,
+        'donor': accepted_donor,
+        'requested_donors_count': requested_donors_count
+    }
+    
+    # Get hospital staff emails
+    if staff_emails is None:
         from accounts.models import HospitalStaff
-        staff_emails = [staff.user.email for staff in HospitalStaff.objects.filter(hospital=hospital) if staff.user.email]
+        staff_emails = [staff.user.email for staff in HospitalStaff.objects.filter(hospital=hospital).select_related('user') if staff.user.email]
+    
+    if not staff_emails:
+        return None
+    
+    # HTML content
+    html_content = render_to_string(html_template, context)
+    text_content = render_to_string(text_template, context)
+    
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=staff_emails
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+@traced('email.hospital_status')
+def send_hospital_status_email(blood_request, status, accepted_donor=None):
+    """
+    Send email to hospital about request status changes
+    """
+    try:
+        email = build_hospital_status_email(blood_request, status, accepted_donor)
         
-        if staff_emails:
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=staff_emails
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send(fail_silently=True)
+        if email is not None:
+            with span('smtp.send', request_id=blood_request.id, recipients=len(email.to)):
+                email.send(fail_silently=True)
             
             logger.info(f"Status update email sent to hospital staff for {blood_request.patient_name} - Status: {status}")
             return True
@@ -143,5 +200,70 @@ def send_hospital_status_email(blood_request, status, accepted_donor=None):
         return False
         
     except Exception as e:
+        current_span().record_exception(e)
         logger.error(f"Failed to send hospital status email: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+class EmailQueue:
+    """
+    Collects built messages and sends them in batches of
+    ``EMAIL_BATCH_SIZE`` over a single SMTP connection, instead of one
+    connection per ``email.send()``. Used by the bulk endpoints; queued
+    messages show up in the ``email_queue_depth`` gauge until flushed.
+    """
+    instances = weakref.WeakSet()
+    
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 50)
+        self.messages = []
+        self.sent = 0
+        self.failed = 0
+        EmailQueue.instances.add(self)
+    
+    @property
+    def depth(self):
+        return len(self.messages)
+    
+    def add(self, message):
+        if message is not None:
+            self.messages.append(message)
+    
+    def flush(self, connection=None, on_batch=None):
+        """
+        Send everything queued; returns the number of messages sent. Pass an
+        open ``connection`` to share it across several flushes, and
+        ``on_batch(messages, sent)`` to act on each batch's outcome.
+        """
+        if not self.messages:
+            return 0
+        # Per-flush counts; self.sent/self.failed keep the queue's totals
+        sent_now = failed_now = 0
+        with span('email.queue_flush', messages=len(self.messages)) as flush_span:
+            try:
+                with nullcontext(connection) if connection is not None else get_connection() as connection:
+                    while self.messages:
+                        batch = self.messages[:self.batch_size]
+                        try:
+                            with span('smtp.send', recipients=len(batch)):
+                                sent = connection.send_messages(batch) or 0
+                        except Exception as e:
+                            current_span().record_exception(e)
+                            logger.error(f"Failed to send email batch: {str(e)}")
+                            sent = 0
+                        sent_now += sent
+                        failed_now += len(batch) - sent
+                        del self.messages[:len(batch)]
+                        if on_batch is not None:
+                            on_batch(batch, sent)
+            except Exception as e:
+                flush_span.record_exception(e)
+                logger.error(f"Failed to flush email queue: {str(e)}")
+                failed_now += len(self.messages)
+                self.messages.clear()
+            flush_span.set_attribute('sent', sent_now)
+        
+        self.sent += sent_now
+        self.failed += failed_now
+        logger.info(f"Email queue flushed: {sent_now} sent, {failed_now} failed")
+        return sent_now
@@ -0,0 +1,229 @@
+"""
+Pub/sub fan-out for the server-sent events stream.
+
+Views publish small events (ids and a few display fields) on named channels:
+``donor:<donor_id>`` for new donor notifications and ``managers`` for new
+pending blood requests. Connected SSE clients subscribe through the backend
+configured in ``EVENTS_BACKEND``:
+
+- ``InProcessBackend`` delivers straight to subscribers of this process
+  (single node, or a single ASGI worker).
+- ``CacheBackend`` relays events through the shared Django cache so every
+  worker/node picks them up - a stand-in for Redis pub/sub that works with
+  any shared cache backend.
+
+Each subscriber is just a bounded ``asyncio.Queue``, so idle connections
+cost a coroutine and a queue rather than a thread.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+MANAGERS_CHANNEL = 'managers'
+
+
+def donor_channel(donor_id):
+    return f"donor:{donor_id}"
+
+
+class Subscription:
+    """A single client's view of one or more channels"""
+
+    def __init__(self, backend, channels, maxsize):
+        self.backend = backend
+        self.channels = tuple(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, event):
+        # Slow clients lose their oldest events instead of growing memory
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Next event, or None if nothing arrived within ``timeout`` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessBackend:
+    """Delivers events to subscribers connected to this process"""
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({sub for subs in self._subscribers.values() for sub in subs})
+
+    def deliver(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            # Publishers usually run in a worker thread, subscribers on the loop
+            subscription.loop.call_soon_threadsafe(subscription.offer, event)
+
+    def publish(self, channel, event):
+        self.deliver(channel, event)
+
+
+class CacheBackend(InProcessBackend):
+    """
+    Relays events through a shared cache so subscribers on every node see
+    them. Publishers append to a sequence-numbered log in the cache; each
+    process runs one pump task that polls the sequence and delivers new
+    entries to its local subscribers.
+
+    A publisher takes its sequence number before it writes the entry, so
+    the pump can see a number whose entry isn't there yet. It stops at
+    that gap and retries on the next poll; only after ``gap_timeout``
+    seconds (default: the entry TTL), and once a later entry exists, is
+    the missing one given up as lost.
+    """
+    SEQUENCE_KEY = 'events:seq'
+
+    def __init__(self, queue_size=100, poll_interval=0.5, ttl=60, gap_timeout=None):
+        super().__init__(queue_size)
+        self.poll_interval = poll_interval
+        self.ttl = ttl
+        self.gap_timeout = ttl if gap_timeout is None else gap_timeout
+        self._pump_task = None
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'EVENTS_CACHE_ALIAS', 'default')]
+
+    def publish(self, channel, event):
+        cache = self.cache
+        cache.add(self.SEQUENCE_KEY, 0, timeout=None)
+        try:
+            sequence = cache.incr(self.SEQUENCE_KEY)
+        except ValueError:
+            cache.set(self.SEQUENCE_KEY, 1, timeout=None)
+            sequence = 1
+        cache.set(f"events:{sequence}", (channel, event), timeout=self.ttl)
+
+    def subscribe(self, channels):
+        subscription = super().subscribe(channels)
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = subscription.loop.create_task(self._pump())
+        return subscription
+
+    async def _pump(self):
+        last_seen = await self.cache.aget(self.SEQUENCE_KEY) or 0
+        gap_since = None
+        while self.subscriber_count():
+            await asyncio.sleep(self.poll_interval)
+            try:
+                current = await self.cache.aget(self.SEQUENCE_KEY) or 0
+                if current <= last_seen:
+                    continue
+                entries = await self.cache.aget_many(
+                    [f"events:{seq}" for seq in range(last_seen + 1, current + 1)]
+                )
+                last_written = max(int(key.split(':')[1]) for key in entries) if entries else 0
+                for seq in range(last_seen + 1, current + 1):
+                    entry = entries.get(f"events:{seq}")
+                    if entry is None:
+                        now = time.monotonic()
+                        if gap_since is None:
+                            gap_since = now
+                        if now - gap_since < self.gap_timeout or seq > last_written:
+                            # Not written yet; pick it up on the next poll
+                            break
+                        logger.warning(f"Event {seq} was never written; skipping it")
+                    else:
+                        channel, event = entry
+                        self.deliver(channel, event)
+                        gap_since = None
+                    last_seen = seq
+            except Exception as e:
+                logger.error(f"Event pump error: {str(e)}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_class = import_string(
+                    getattr(settings, 'EVENTS_BACKEND', 'requests.events.InProcessBackend')
+                )
+                _backend = backend_class(**getattr(settings, 'EVENTS_BACKEND_OPTIONS', {}))
+    return _backend
+
+
+def publish(channel, event):
+    """Publish ``event`` once the current transaction commits"""
+    def send():
+        try:
+            get_backend().publish(channel, event)
+        except Exception as e:
+            logger.error(f"Event publish failed on {channel}: {str(e)}")
+
+    transaction.on_commit(send)
+
+
+def publish_donor_notifications(notifications):
+    """Push freshly created notifications to the donors' streams"""
+    for notification in notifications:
+        blood_request = notification.blood_request
+        publish(donor_channel(notification.donor_id), {
+            'type': 'notification',
+            'notification_id': notification.id,
+            'request_id': blood_request.id,
+            'blood_group': blood_request.blood_group,
+            'urgency_level': blood_request.urgency_level,
+            'hospital_name': blood_request.hospital.name,
+        })
+
+
+def publish_pending_request(blood_request):
+    """Tell connected managers about a new request awaiting approval"""
+    publish(MANAGERS_CHANNEL, {
+        'type': 'pending_request',
+        'request_id': blood_request.id,
+        'blood_group': blood_request.blood_group,
+        'urgency_level': blood_request.urgency_level,
+        'hospital_id': blood_request.hospital_id,
+    })
@@ -0,0 +1,121 @@
+"""
+``Idempotency-Key`` support for POST endpoints.
+
+A client that may retry a POST (flaky network, double click) sends the
+same ``Idempotency-Key`` header on every attempt. The first attempt runs
+the view and stores its response; retries with the same key and the same
+body get that stored response back (with ``Idempotent-Replayed: true``)
+without running matching, notifications or emails again::
+
+    @api_view(['POST'])
+    @permission_classes([IsAuthenticated])
+    @idempotent
+    def approve_request(request, request_id):
+        ...
+
+- same key, different body: 422;
+- same key while the first attempt is still running: 409 (retry later);
+- 5xx responses and exceptions are not stored, so the key can be retried.
+
+Keys are scoped per user and kept for ``IDEMPOTENCY_KEY_TTL_HOURS``
+(``manage.py purge_idempotency_keys`` deletes expired rows). Requests
+without the header behave exactly as before.
+"""
+import functools
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'Idempotency-Key'
+
+
+def request_fingerprint(request, kwargs):
+    """Hash of what the request asks for: method, path, URL kwargs and body"""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps([request.method, request.path, kwargs, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def claim(request, key, endpoint, fingerprint):
+    """
+    Create the in-progress row for ``key``, or return the existing one.
+    Expired rows and stale in-progress rows are taken over.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(hours=getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24))
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                user=request.user, key=key, endpoint=endpoint,
+                request_fingerprint=fingerprint, expires_at=expires_at
+            ), True
+    except IntegrityError:
+        pass
+
+    record = IdempotencyKey.objects.get(user=request.user, key=key)
+    lock_timeout = timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_SECONDS', 60))
+    stale = record.status_code is None and record.created_at <= now - lock_timeout
+    if record.expires_at > now and not stale:
+        return record, False
+
+    # Only one of several concurrent retries wins the takeover
+    taken = IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).update(
+        endpoint=endpoint, request_fingerprint=fingerprint, status_code=None,
+        response_body=None, created_at=now, expires_at=expires_at
+    )
+    if not taken:
+        return IdempotencyKey.objects.get(pk=record.pk), False
+    record.refresh_from_db()
+    return record, True
+
+
+def idempotent(view):
+    """Decorator for DRF function views; place it under @permission_classes"""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or request.method != 'POST':
+            return view(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({'error': f"{HEADER} must be at most 255 characters"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fingerprint = request_fingerprint(request, kwargs)
+        record, created = claim(request, key, view.__name__, fingerprint)
+
+        if not created:
+            if record.request_fingerprint != fingerprint or record.endpoint != view.__name__:
+                return Response({'error': f"{HEADER} was already used for a different request"},
+                                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            if record.status_code is None:
+                return Response({'error': 'A request with this Idempotency-Key is still being processed'},
+                                status=status.HTTP_409_CONFLICT, headers={'Retry-After': '1'})
+            logger.info(f"Replayed {view.__name__} response for Idempotency-Key {key}")
+            return Response(record.response_body, status=record.status_code,
+                            headers={'Idempotent-Replayed': 'true'})
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if not isinstance(response, Response) or response.status_code >= 500:
+            # Let the client retry with the same key
+            record.delete()
+        else:
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=['status_code', 'response_body'])
+        return response
+    return wrapper
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from requests.archive import archivable_requests, archive_closed_requests
+
+class Command(BaseCommand):
+    help = 'Move closed blood requests (with notifications and donation records) to the archive tables'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Archive requests closed more than this many days ago (default: 90)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Requests moved per transaction (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be archived'
+        )
+    
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--days and --chunk-size must be at least 1')
+        
+        if options['dry_run']:
+            candidates = archivable_requests(options['days'])
+            counts = candidates.aggregate(
+                requests=Count('id', distinct=True),
+                notifications=Count('donornotification', distinct=True),
+                donations=Count('donationrecord', distinct=True),
+            )
+            self.stdout.write(
+                f"Would archive {counts['requests']} requests, {counts['notifications']} notifications "
+                f"and {counts['donations']} donation records"
+            )
+            return
+        
+        totals = {'requests': 0, 'notifications': 0, 'donations': 0}
+        for counts in archive_closed_requests(options['days'], options['chunk_size']):
+            for key, value in counts.items():
+                totals[key] += value
+            self.stdout.write(f"Archived {totals['requests']} requests so far...")
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Archived {totals['requests']} requests, {totals['notifications']} notifications "
+                f"and {totals['donations']} donation records"
+            )
+        )
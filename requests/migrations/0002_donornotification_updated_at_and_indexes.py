@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('donors', '0002_donor_availability_index'),
+        ('requests', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donornotification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='bloodrequest',
+            index=models.Index(fields=['status', 'updated_at'], name='requests_bl_status_952f5c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bloodrequest',
+            index=models.Index(fields=['hospital', 'updated_at'], name='requests_bl_hospita_ed12b5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donornotification',
+            index=models.Index(fields=['donor', 'updated_at'], name='requests_do_donor_i_f0ef04_idx'),
+        ),
+    ]
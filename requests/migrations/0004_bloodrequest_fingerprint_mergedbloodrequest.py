@@ -0,0 +1,71 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:40
+
+import django.db.models.deletion
+import hashlib
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Same normalization as requests.models.blood_request_fingerprint
+    BloodRequest = apps.get_model('requests', 'BloodRequest')
+    batch = []
+    for blood_request in BloodRequest.objects.only(
+        'id', 'hospital_id', 'patient_name', 'patient_age', 'blood_group', 'operation_id'
+    ).iterator(chunk_size=2000):
+        parts = [
+            str(blood_request.hospital_id),
+            ' '.join(blood_request.patient_name.split()).casefold(),
+            str(blood_request.patient_age),
+            blood_request.blood_group.strip().upper(),
+            ' '.join((blood_request.operation_id or '').split()).casefold(),
+        ]
+        blood_request.fingerprint = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+        batch.append(blood_request)
+        if len(batch) >= 2000:
+            BloodRequest.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    if batch:
+        BloodRequest.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_revokedtoken_user_tokens_valid_after'),
+        ('donors', '0002_donor_availability_index'),
+        ('requests', '0003_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergedBloodRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units_required', models.IntegerField()),
+                ('urgency_level', models.CharField(max_length=20)),
+                ('merged_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='bloodrequest',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='bloodrequest',
+            index=models.Index(fields=['fingerprint', 'created_at'], name='requests_bl_fingerp_cde8b4_idx'),
+        ),
+        migrations.AddField(
+            model_name='mergedbloodrequest',
+            name='blood_request',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='merged_duplicates', to='requests.bloodrequest'),
+        ),
+        migrations.AddField(
+            model_name='mergedbloodrequest',
+            name='submitted_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
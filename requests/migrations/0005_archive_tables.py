@@ -0,0 +1,74 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_revokedtoken_user_tokens_valid_after'),
+        ('donors', '0002_donor_availability_index'),
+        ('requests', '0004_bloodrequest_fingerprint_mergedbloodrequest'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBloodRequest',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('patient_name', models.CharField(max_length=200)),
+                ('patient_age', models.IntegerField()),
+                ('patient_gender', models.CharField(choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], max_length=1)),
+                ('blood_group', models.CharField(choices=[('A+', 'A+'), ('A-', 'A-'), ('B+', 'B+'), ('B-', 'B-'), ('AB+', 'AB+'), ('AB-', 'AB-'), ('O+', 'O+'), ('O-', 'O-')], max_length=3)),
+                ('units_required', models.IntegerField(default=1)),
+                ('hemoglobin_level', models.DecimalField(decimal_places=2, max_digits=4)),
+                ('diagnosis', models.TextField()),
+                ('operation_id', models.CharField(blank=True, max_length=100)),
+                ('urgency_level', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='accounts.hospital')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedDonationRecord',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('donation_date', models.DateTimeField()),
+                ('units_donated', models.IntegerField(default=1)),
+                ('notes', models.TextField(blank=True)),
+                ('blood_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='requests.archivedbloodrequest')),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='donors.donor')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedDonorNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('declined', 'Declined'), ('expired', 'Expired')], max_length=20)),
+                ('notification_sent_at', models.DateTimeField()),
+                ('responded_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField()),
+                ('blood_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='requests.archivedbloodrequest')),
+                ('donor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='donors.donor')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='archivedbloodrequest',
+            index=models.Index(fields=['hospital', 'updated_at'], name='requests_ar_hospita_f2a9ee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddonationrecord',
+            index=models.Index(fields=['donor', 'donation_date'], name='requests_ar_donor_i_8a7bad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archiveddonornotification',
+            index=models.Index(fields=['donor', 'updated_at'], name='requests_ar_donor_i_265d26_idx'),
+        ),
+    ]
@@ -1,6 +1,23 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from donors.models import Donor
 from accounts.models import Hospital
+import hashlib
+
+
+def blood_request_fingerprint(hospital_id, patient_name, patient_age, blood_group, operation_id=''):
+    """
+    Normalized identity of a request: the same hospital, patient (name case
+    and spacing ignored), age, blood group and operation id hash the same
+    """
+    parts = [
+        str(hospital_id),
+        ' '.join(str(patient_name).split()).casefold(),
+        str(patient_age),
+        str(blood_group).strip().upper(),
+        ' '.join(str(operation_id or '').split()).casefold(),
+    ]
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
 
 class BloodRequest(models.Model):
     STATUS_CHOICES = (
@@ -35,11 +52,43 @@ class BloodRequest(models.Model):
     approved_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, 
                                    null=True, blank=True, related_name='approved_requests')
     
+    # Duplicate detection at creation time (see requests/duplicates.py)
+    fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Cheap max(updated_at)/count lookups for ETags on polling endpoints
+            models.Index(fields=['status', 'updated_at']),
+            models.Index(fields=['hospital', 'updated_at']),
+            models.Index(fields=['fingerprint', 'created_at']),
+        ]
+
     def __str__(self):
         return f"Request for {self.patient_name} ({self.blood_group})"
+    
+    def save(self, *args, **kwargs):
+        self.fingerprint = blood_request_fingerprint(
+            self.hospital_id, self.patient_name, self.patient_age, self.blood_group, self.operation_id
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'fingerprint' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['fingerprint']
+        super().save(*args, **kwargs)
+
+
+class MergedBloodRequest(models.Model):
+    """A duplicate submission that was folded into an open request"""
+    blood_request = models.ForeignKey(BloodRequest, on_delete=models.CASCADE, related_name='merged_duplicates')
+    submitted_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, blank=True)
+    units_required = models.IntegerField()
+    urgency_level = models.CharField(max_length=20)
+    merged_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Duplicate of request {self.blood_request_id}"
 
 class DonorNotification(models.Model):
     STATUS_CHOICES = (
@@ -54,9 +103,13 @@ class DonorNotification(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     notification_sent_at = models.DateTimeField(auto_now_add=True)
     responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ('blood_request', 'donor')
+        indexes = [
+            models.Index(fields=['donor', 'updated_at']),
+        ]
 
 # class DonationRecord(models.Model):
 #     blood_request = models.ForeignKey(BloodRequest, on_delete=models.CASCADE)
@@ -83,4 +136,84 @@ class DonationRecord(models.Model):
         if not self.donation_date:
             from django.utils import timezone
             self.donation_date = timezone.now()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied Idempotency-Key and the response it produced, so a
+    retried POST replays that response instead of running again. Rows
+    expire after IDEMPOTENCY_KEY_TTL_HOURS.
+    """
+    user = models.ForeignKey('accounts.User', on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=100)
+    request_fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # None while in progress
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        unique_together = ('user', 'key')
+    
+    def __str__(self):
+        return f"{self.endpoint} {self.key}"
+
+
+# Cold storage for closed requests (see requests/archive.py). Rows keep
+# their original ids so references in logs and emails still resolve.
+class ArchivedBloodRequest(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE)
+    patient_name = models.CharField(max_length=200)
+    patient_age = models.IntegerField()
+    patient_gender = models.CharField(max_length=1, choices=Donor.GENDER_CHOICES)
+    blood_group = models.CharField(max_length=3, choices=Donor.BLOOD_GROUP_CHOICES)
+    units_required = models.IntegerField(default=1)
+    hemoglobin_level = models.DecimalField(max_digits=4, decimal_places=2)
+    diagnosis = models.TextField()
+    operation_id = models.CharField(max_length=100, blank=True)
+    urgency_level = models.CharField(max_length=20)
+    status = models.CharField(max_length=20, choices=BloodRequest.STATUS_CHOICES)
+    approved_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL,
+                                    null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['hospital', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"Archived request for {self.patient_name} ({self.blood_group})"
+
+
+class ArchivedDonorNotification(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    blood_request = models.ForeignKey(ArchivedBloodRequest, on_delete=models.CASCADE)
+    donor = models.ForeignKey(Donor, on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=DonorNotification.STATUS_CHOICES)
+    notification_sent_at = models.DateTimeField()
+    responded_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['donor', 'updated_at']),
+        ]
+
+
+class ArchivedDonationRecord(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    blood_request = models.ForeignKey(ArchivedBloodRequest, on_delete=models.CASCADE)
+    donor = models.ForeignKey(Donor, on_delete=models.CASCADE)
+    donation_date = models.DateTimeField()
+    units_donated = models.IntegerField(default=1)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['donor', 'donation_date']),
+        ]
@@ -1,17 +1,20 @@
 from rest_framework import serializers
-from .models import BloodRequest, DonorNotification, DonationRecord
+from .models import BloodRequest, DonorNotification, DonationRecord, ArchivedBloodRequest, ArchivedDonationRecord
 from accounts.serializers import HospitalRegistrationSerializer
+from blood_donation.serializers import SparseFieldsetMixin
 
-class BloodRequestSerializer(serializers.ModelSerializer):
+class BloodRequestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     hospital_name = serializers.CharField(source='hospital.name', read_only=True)
     hospital_city = serializers.CharField(source='hospital.city', read_only=True)
     
     class Meta:
         model = BloodRequest
-        fields = '__all__'
+        exclude = ('fingerprint',)
         read_only_fields = ('status', 'approved_by', 'created_at', 'updated_at')
+        # Left out of compact list payloads unless asked for with ?expand=
+        expandable_fields = ('diagnosis', 'requested_donors')
 
-class DonorNotificationSerializer(serializers.ModelSerializer):
+class DonorNotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     donor_name = serializers.CharField(source='donor.full_name', read_only=True)
     donor_blood_group = serializers.CharField(source='donor.blood_group', read_only=True)
     donor_contact = serializers.CharField(source='donor.user.phone_number', read_only=True)
@@ -32,4 +35,23 @@ class DonationRecordSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = DonationRecord
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class ArchivedBloodRequestSerializer(serializers.ModelSerializer):
+    hospital_name = serializers.CharField(source='hospital.name', read_only=True)
+    hospital_city = serializers.CharField(source='hospital.city', read_only=True)
+    archived = serializers.BooleanField(default=True, read_only=True)
+    
+    class Meta:
+        model = ArchivedBloodRequest
+        fields = '__all__'
+
+class ArchivedDonationRecordSerializer(serializers.ModelSerializer):
+    donor_name = serializers.CharField(source='donor.full_name', read_only=True)
+    patient_name = serializers.CharField(source='blood_request.patient_name', read_only=True)
+    hospital_name = serializers.CharField(source='blood_request.hospital.name', read_only=True)
+    archived = serializers.BooleanField(default=True, read_only=True)
+    
+    class Meta:
+        model = ArchivedDonationRecord
+        fields = '__all__'
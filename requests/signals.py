@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from blood_donation.cache import bump_version
+from .events import publish_pending_request, publish_donor_notifications
+from .models import BloodRequest, DonorNotification
+
+
+@receiver([post_save, post_delete], sender=BloodRequest)
+def invalidate_blood_request_cache(sender, **kwargs):
+    """Any blood request write invalidates cached request lists"""
+    bump_version('blood_request')
+
+
+@receiver(post_save, sender=BloodRequest)
+def push_pending_request(sender, instance, created, **kwargs):
+    """New requests show up on connected managers' event streams"""
+    if created and instance.status == 'pending':
+        publish_pending_request(instance)
+
+
+@receiver(post_save, sender=DonorNotification)
+def push_donor_notification(sender, instance, created, **kwargs):
+    # approve_request uses bulk_create (no signal) and publishes explicitly
+    if created:
+        publish_donor_notifications([instance])
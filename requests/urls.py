@@ -3,9 +3,13 @@ from . import views
 
 urlpatterns = [
     path('pending/', views.pending_requests, name='pending-requests'),  # /api/requests/pending/
+    path('duplicates/', views.duplicate_requests, name='duplicate-requests'),  # /api/requests/duplicates/
+    path('bulk/approve/', views.bulk_approve_requests, name='bulk-approve-requests'),  # /api/requests/bulk/approve/
+    path('bulk/reject/', views.bulk_reject_requests, name='bulk-reject-requests'),  # /api/requests/bulk/reject/
     path('<int:request_id>/approve/', views.approve_request, name='approve-request'),  # /api/requests/{id}/approve/
     path('<int:request_id>/reject/', views.reject_request, name='reject-request'),  # /api/requests/{id}/reject/
     path('notifications/<int:notification_id>/respond/', views.donor_response, name='donor-response'),  # /api/requests/notifications/{id}/respond/
     path('notifications/donor/', views.donor_notifications, name='donor-notifications'),  # /api/requests/notifications/donor/
+    path('events/', views.event_stream, name='event-stream'),  # /api/requests/events/ (SSE, ASGI only)
     path('test-email/', views.test_email, name='test-email'),  # /api/requests/test-email/
 ]
\ No newline at end of file
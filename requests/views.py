@@ -2,10 +2,34 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from accounts.authentication import CachedJWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from .models import BloodRequest, DonorNotification, DonationRecord
+from .models import BloodRequest, DonorNotification, DonationRecord, MergedBloodRequest
 from .serializers import BloodRequestSerializer, DonorNotificationSerializer
-from .email_utils import send_donation_request_email, send_request_fulfilled_email, send_hospital_status_email
+from .email_utils import (
+    EmailQueue, build_donation_request_email, build_hospital_status_email,
+    send_donation_request_email, send_request_fulfilled_email, send_hospital_status_email,
+)
+from .idempotency import idempotent
+from .events import get_backend, publish_donor_notifications, donor_channel, MANAGERS_CHANNEL
+from blood_donation.bulk import parse_id_list
+from blood_donation.cache import bump_version, get_or_build, get_version
+from blood_donation.conditional import compute_etag, queryset_state, not_modified, with_etag
+from blood_donation.serializers import sparse_params
+from logs.tracing import span, traced, current_span
+from django.db.models import Count, Max, Q
+from datetime import date, datetime, timedelta
+import base64
+import binascii
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,12 +41,30 @@ def pending_requests(request):
         if request.user.user_type != 'blood_bank_manager':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        pending_requests = BloodRequest.objects.filter(status='pending')
-        serializer = BloodRequestSerializer(pending_requests, many=True)
-        return Response({
-            'count': pending_requests.count(),
-            'requests': serializer.data
-        })
+        # Answer unchanged polls before touching the payload
+        etag = compute_etag(
+            'pending_requests',
+            *queryset_state(BloodRequest.objects.filter(status='pending')),
+            get_version('hospital')
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
+        
+        params = sparse_params(request)
+        
+        def build():
+            pending_requests = BloodRequestSerializer.narrow(
+                BloodRequest.objects.filter(status='pending').select_related('hospital'), **params
+            )
+            serializer = BloodRequestSerializer(pending_requests, many=True, **params)
+            return {
+                'count': pending_requests.count(),
+                'requests': serializer.data
+            }
+        
+        data, hit = get_or_build('pending_requests', ('blood_request', 'hospital'), build, params)
+        return with_etag(Response(data, headers={'X-Cache': 'HIT' if hit else 'MISS'}), etag)
     except Exception as e:
         logger.error(f"Pending requests fetch error: {str(e)}")
         return Response({'error': 'Failed to fetch pending requests'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -30,6 +72,7 @@ def pending_requests(request):
   
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
 def reject_request(request, request_id):
     try:
         if request.user.user_type != 'blood_bank_manager':
@@ -53,9 +96,14 @@ def reject_request(request, request_id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
+@traced('donor_response')
 def donor_response(request, notification_id):
+    current_span().set_attribute('notification_id', notification_id)
     try:
-        notification = DonorNotification.objects.get(id=notification_id)
+        notification = DonorNotification.objects.select_related(
+            'donor__user', 'blood_request__hospital'
+        ).get(id=notification_id)
         
         if notification.donor.user != request.user:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
@@ -71,24 +119,25 @@ def donor_response(request, notification_id):
                     'message': message
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            notification.status = 'accepted'
-            notification.responded_at = timezone.now()
-            notification.save()
-            
-            # Create donation record
-            donation_record = DonationRecord.objects.create(
-                blood_request=notification.blood_request,
-                donor=notification.donor,
-                units_donated=notification.blood_request.units_required
-            )
-            
-            # ✅ AUTOMATICALLY UPDATE DONOR'S DONATION RECORDS
-            notification.donor.update_donation_record()
-            
-            # Update blood request status to completed
-            blood_request = notification.blood_request
-            blood_request.status = 'completed'
-            blood_request.save()
+            with span('db.record_donation', donor_id=notification.donor_id):
+                notification.status = 'accepted'
+                notification.responded_at = timezone.now()
+                notification.save()
+                
+                # Create donation record
+                donation_record = DonationRecord.objects.create(
+                    blood_request=notification.blood_request,
+                    donor=notification.donor,
+                    units_donated=notification.blood_request.units_required
+                )
+                
+                # ✅ AUTOMATICALLY UPDATE DONOR'S DONATION RECORDS
+                notification.donor.update_donation_record()
+                
+                # Update blood request status to completed
+                blood_request = notification.blood_request
+                blood_request.status = 'completed'
+                blood_request.save()
             
             # Notify other donors that request is fulfilled
             notify_other_donors(blood_request, notification.donor)
@@ -122,6 +171,7 @@ def send_donor_notification(notification):
     """
     return send_donation_request_email(notification)
 
+@traced('notify_other_donors')
 def notify_other_donors(blood_request, accepted_donor):
     """
     Notify other donors that the request has been fulfilled
@@ -129,11 +179,18 @@ def notify_other_donors(blood_request, accepted_donor):
     try:
         other_notifications = DonorNotification.objects.filter(
             blood_request=blood_request
-        ).exclude(donor=accepted_donor)
+        ).exclude(donor=accepted_donor).select_related('donor__user', 'blood_request__hospital')
+        other_notifications = list(other_notifications)
+        
+        # One UPDATE instead of a save() per notification; update() skips
+        # auto_now, so updated_at is set here for delta sync
+        DonorNotification.objects.filter(
+            id__in=[notification.id for notification in other_notifications]
+        ).update(status='expired', updated_at=timezone.now())
+        current_span().set_attribute('notifications', len(other_notifications))
         
         for notification in other_notifications:
             notification.status = 'expired'
-            notification.save()
             
             # Send thank you email using the new email utility
             send_request_fulfilled_email(notification, accepted_donor)
@@ -146,123 +203,143 @@ def notify_other_donors(blood_request, accepted_donor):
     except Exception as e:
         logger.error(f"Other donors notification error: {str(e)}")
 
+def eligible_donors(queryset, key=None, donor_cache=None):
+    """
+    Donors from ``queryset`` who can donate now. Bulk approval passes a
+    shared ``donor_cache`` so requests with the same blood group and
+    location reuse one query.
+    """
+    if donor_cache is not None and key in donor_cache:
+        return donor_cache[key]
+    donors = []
+    for donor in queryset.select_related('user'):
+        can_donate, _ = donor.can_donate()
+        if can_donate:
+            donors.append(donor)
+    if donor_cache is not None:
+        donor_cache[key] = donors
+    return donors
+
+def match_donors(blood_request, donor_cache=None):
+    """
+    Unsaved DonorNotifications for a request, using the tiered search:
+    same city first, then same state, then (if still very few) up to 5
+    donors from elsewhere.
+    """
+    from donors.models import Donor
+    
+    hospital = blood_request.hospital
+    blood_group = blood_request.blood_group
+    
+    # Match on the normalized City/State ids when the hospital's address
+    # resolved to them, falling back to case-insensitive text otherwise.
+    # Donors whose own address hasn't resolved (yet) are compared as text.
+    if hospital.city_ref_id:
+        same_city = Q(city_ref_id=hospital.city_ref_id) | Q(city_ref__isnull=True, city__iexact=hospital.city)
+        city = (hospital.city_ref_id, hospital.city.lower())
+    else:
+        same_city, city = Q(city__iexact=hospital.city), hospital.city.lower()
+    if hospital.state_ref_id:
+        same_state = Q(state_ref_id=hospital.state_ref_id) | Q(state_ref__isnull=True, state__iexact=hospital.state)
+        state = (hospital.state_ref_id, hospital.state.lower())
+    else:
+        same_state, state = Q(state__iexact=hospital.state), hospital.state.lower()
+    
+    logger.info(f"Starting tiered donor search for blood request {blood_request.id} in {hospital.city}, {hospital.state}")
+    
+    candidates = Donor.objects.filter(blood_group=blood_group, is_verified=True, is_available=True)
+    
+    # Tier 1: Find eligible donors in the SAME CITY as hospital
+    with span('match.same_city', city=hospital.city) as stage:
+        local_donors = eligible_donors(
+            candidates.filter(same_city), ('city', blood_group, city), donor_cache
+        )
+        stage.set_attribute('donors', len(local_donors))
+    
+    logger.info(f"Tier 1 (Same City): Found {len(local_donors)} donors in {hospital.city}")
+    
+    notifications = [
+        DonorNotification(blood_request=blood_request, donor=donor, status='pending')
+        for donor in local_donors
+    ]
+    for donor in local_donors:
+        logger.info(f" - Local donor: {donor.full_name} in {donor.city}")
+    
+    # If we have enough local donors (5+), only notify them
+    if len(local_donors) >= 5:
+        logger.info(f"✅ Enough local donors found ({len(local_donors)}). Notifying only local donors.")
+        return notifications
+    
+    # Tier 2: Not enough local donors, expand to SAME STATE
+    logger.info(f"❌ Not enough local donors ({len(local_donors)}). Expanding search to state level.")
+    
+    with span('match.same_state', state=hospital.state) as stage:
+        state_donors = eligible_donors(
+            candidates.filter(same_state).exclude(same_city),
+            ('state', blood_group, state, city), donor_cache
+        )
+        stage.set_attribute('donors', len(state_donors))
+    
+    logger.info(f"Tier 2 (Same State): Found {len(state_donors)} donors in {hospital.state}")
+    
+    for donor in state_donors:
+        notifications.append(DonorNotification(blood_request=blood_request, donor=donor, status='pending'))
+        logger.info(f" - State donor: {donor.full_name} in {donor.city}, {donor.state}")
+    
+    # If still not enough, consider national level (optional)
+    if len(notifications) < 3:  # If we have very few donors
+        with span('match.national') as stage:
+            national_donors = eligible_donors(
+                candidates.exclude(same_state), ('national', blood_group, state), donor_cache
+            )
+            stage.set_attribute('donors', len(national_donors))
+        
+        logger.info(f"Tier 3 (National): Found {len(national_donors)} donors outside {hospital.state}")
+        
+        # Add a limited number of national donors (max 5 to avoid spam)
+        for donor in national_donors[:5]:
+            notifications.append(DonorNotification(blood_request=blood_request, donor=donor, status='pending'))
+            logger.info(f" - National donor: {donor.full_name} in {donor.city}, {donor.state}")
+    
+    return notifications
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent
+@traced('approve_request')
 def approve_request(request, request_id):
+    current_span().set_attribute('request_id', request_id)
     try:
         if request.user.user_type != 'blood_bank_manager':
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        blood_request = BloodRequest.objects.get(id=request_id)
+        blood_request = BloodRequest.objects.select_related('hospital').get(id=request_id)
+        if blood_request.status == 'approved':
+            # Re-approving would notify the same donors twice
+            return Response({'error': 'Request is already approved'}, status=status.HTTP_409_CONFLICT)
         blood_request.status = 'approved'
         blood_request.approved_by = request.user
         blood_request.save()
         
         # ✅ TIERED DONOR NOTIFICATION SYSTEM
-        from donors.models import Donor
-        
-        logger.info(f"Starting tiered donor search for blood request {request_id} in {blood_request.hospital.city}, {blood_request.hospital.state}")
-        
-        # Tier 1: Find eligible donors in the SAME CITY as hospital
-        local_donors = []
-        for donor in Donor.objects.filter(
-            blood_group=blood_request.blood_group,
-            is_verified=True,
-            is_available=True,
-            city__iexact=blood_request.hospital.city
-        ):
-            can_donate, _ = donor.can_donate()
-            if can_donate:
-                local_donors.append(donor)
-        
-        logger.info(f"Tier 1 (Same City): Found {len(local_donors)} donors in {blood_request.hospital.city}")
-        
-        notifications = []
+        notifications = match_donors(blood_request)
         email_count = 0
         
-        # If we have enough local donors (5+), only notify them
-        if len(local_donors) >= 5:
-            logger.info(f"✅ Enough local donors found ({len(local_donors)}). Notifying only local donors.")
-            for donor in local_donors:
-                notification = DonorNotification(
-                    blood_request=blood_request,
-                    donor=donor,
-                    status='pending'
-                )
-                notifications.append(notification)
-                logger.info(f" - Local donor: {donor.full_name} in {donor.city}")
-        
-        else:
-            # Tier 2: Not enough local donors, expand to SAME STATE
-            logger.info(f"❌ Not enough local donors ({len(local_donors)}). Expanding search to state level.")
-            
-            # First, add all local donors
-            for donor in local_donors:
-                notification = DonorNotification(
-                    blood_request=blood_request,
-                    donor=donor,
-                    status='pending'
-                )
-                notifications.append(notification)
-                logger.info(f" - Local donor: {donor.full_name} in {donor.city}")
-            
-            # Then find donors in the same state but different city
-            state_donors = []
-            for donor in Donor.objects.filter(
-                blood_group=blood_request.blood_group,
-                is_verified=True,
-                is_available=True,
-                state__iexact=blood_request.hospital.state
-            ).exclude(city__iexact=blood_request.hospital.city):
-                can_donate, _ = donor.can_donate()
-                if can_donate:
-                    state_donors.append(donor)
-            
-            logger.info(f"Tier 2 (Same State): Found {len(state_donors)} donors in {blood_request.hospital.state}")
-            
-            # Add state-level donors
-            for donor in state_donors:
-                notification = DonorNotification(
-                    blood_request=blood_request,
-                    donor=donor,
-                    status='pending'
-                )
-                notifications.append(notification)
-                logger.info(f" - State donor: {donor.full_name} in {donor.city}, {donor.state}")
-            
-            # If still not enough, consider national level (optional)
-            if len(notifications) < 3:  # If we have very few donors
-                national_donors = []
-                for donor in Donor.objects.filter(
-                    blood_group=blood_request.blood_group,
-                    is_verified=True,
-                    is_available=True
-                ).exclude(state__iexact=blood_request.hospital.state):
-                    can_donate, _ = donor.can_donate()
-                    if can_donate:
-                        national_donors.append(donor)
-                
-                logger.info(f"Tier 3 (National): Found {len(national_donors)} donors outside {blood_request.hospital.state}")
-                
-                # Add a limited number of national donors (max 5 to avoid spam)
-                for donor in national_donors[:5]:
-                    notification = DonorNotification(
-                        blood_request=blood_request,
-                        donor=donor,
-                        status='pending'
-                    )
-                    notifications.append(notification)
-                    logger.info(f" - National donor: {donor.full_name} in {donor.city}, {donor.state}")
-        
         # Create all notifications and send emails
         if notifications:
-            DonorNotification.objects.bulk_create(notifications)
+            with span('db.bulk_create_notifications', count=len(notifications)):
+                DonorNotification.objects.bulk_create(notifications)
             logger.info(f"✅ Created {len(notifications)} total notifications")
             
+            # Push to donors connected to the event stream
+            publish_donor_notifications(notifications)
+            
             # Send email notifications
-            for notification in notifications:
-                if send_donation_request_email(notification):
-                    email_count += 1
+            with span('email.donor_batch', count=len(notifications)) as stage:
+                for notification in notifications:
+                    if send_donation_request_email(notification):
+                        email_count += 1
+                stage.set_attribute('sent', email_count)
             
             # Log the distribution
             local_count = len([n for n in notifications if n.donor.city.lower() == blood_request.hospital.city.lower()])
@@ -294,6 +371,227 @@ def approve_request(request, request_id):
         logger.error(f"Request approval error: {str(e)}")
         return Response({'error': 'Failed to approve request'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+def apply_bulk_status(request, new_status):
+    """
+    Shared body of bulk approve/reject: moves the pending requests among
+    ``request_ids`` to ``new_status`` with one bulk_update (plus, for
+    approval, one bulk_create of every donor notification) in a single
+    transaction, then sends all emails through one EmailQueue.
+    """
+    request_ids = parse_id_list(request.data, 'request_ids')
+    results = {}
+    notifications_by_request = {}
+    
+    with transaction.atomic():
+        blood_requests = list(
+            BloodRequest.objects.select_for_update().select_related('hospital')
+            .filter(id__in=request_ids, status='pending').order_by('id')
+        )
+        found = {blood_request.id for blood_request in blood_requests}
+        current_statuses = dict(
+            BloodRequest.objects.filter(id__in=set(request_ids) - found).values_list('id', 'status')
+        )
+        for request_id in set(request_ids) - found:
+            if request_id in current_statuses:
+                results[request_id] = {'id': request_id, 'error': f"Request is already {current_statuses[request_id]}"}
+            else:
+                results[request_id] = {'id': request_id, 'error': 'Request not found'}
+        
+        # bulk_update skips auto_now and post_save, so updated_at, the
+        # cache version and events are handled here
+        now = timezone.now()
+        for blood_request in blood_requests:
+            blood_request.status = new_status
+            blood_request.approved_by = request.user
+            blood_request.updated_at = now
+        BloodRequest.objects.bulk_update(blood_requests, ['status', 'approved_by', 'updated_at'])
+        
+        if new_status == 'approved':
+            donor_cache = {}
+            for blood_request in blood_requests:
+                notifications_by_request[blood_request.id] = match_donors(blood_request, donor_cache)
+            notifications = [n for batch in notifications_by_request.values() for n in batch]
+            with span('db.bulk_create_notifications', count=len(notifications)):
+                DonorNotification.objects.bulk_create(notifications, batch_size=1000)
+    
+    bump_version('blood_request')
+    notifications = [n for batch in notifications_by_request.values() for n in batch]
+    publish_donor_notifications(notifications)
+    
+    # Queue every email, then send them over one connection
+    from accounts.models import HospitalStaff
+    staff_emails = {}
+    for staff in HospitalStaff.objects.filter(
+        hospital_id__in={blood_request.hospital_id for blood_request in blood_requests}
+    ).select_related('user'):
+        if staff.user.email:
+            staff_emails.setdefault(staff.hospital_id, []).append(staff.user.email)
+    
+    email_queue = EmailQueue()
+    for blood_request in blood_requests:
+        request_notifications = notifications_by_request.get(blood_request.id, [])
+        try:
+            for notification in request_notifications:
+                email_queue.add(build_donation_request_email(notification))
+            email_queue.add(build_hospital_status_email(
+                blood_request, new_status,
+                requested_donors_count=len(request_notifications),
+                staff_emails=staff_emails.get(blood_request.hospital_id, [])
+            ))
+        except Exception as e:
+            logger.error(f"Failed to build emails for blood request {blood_request.id}: {str(e)}")
+        
+        results[blood_request.id] = {'id': blood_request.id, 'status': new_status}
+        if new_status == 'approved':
+            results[blood_request.id]['notifications_sent'] = len(request_notifications)
+    email_queue.flush()
+    
+    logger.info(f"Bulk {new_status}: {len(blood_requests)} of {len(request_ids)} requests by {request.user.username}")
+    return Response({
+        new_status: len(blood_requests),
+        'failed': len(request_ids) - len(blood_requests),
+        'notifications_sent': len(notifications),
+        'emails_sent': email_queue.sent,
+        'results': [results[request_id] for request_id in request_ids],
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+@traced('bulk_approve_requests')
+def bulk_approve_requests(request):
+    """Approve many pending requests in one call: {"request_ids": [...]}"""
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        return apply_bulk_status(request, 'approved')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"Bulk request approval error: {str(e)}")
+        return Response({'error': 'Failed to approve requests'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@idempotent
+@traced('bulk_reject_requests')
+def bulk_reject_requests(request):
+    """Reject many pending requests in one call: {"request_ids": [...]}"""
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        return apply_bulk_status(request, 'rejected')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        logger.error(f"Bulk request rejection error: {str(e)}")
+        return Response({'error': 'Failed to reject requests'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def duplicate_requests(request):
+    """
+    Report of duplicate submissions merged into open requests over the last
+    ?days= (default 30), most duplicated first
+    """
+    try:
+        if request.user.user_type != 'blood_bank_manager':
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            days = int(request.GET.get('days', 30))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        rows = MergedBloodRequest.objects.filter(
+            merged_at__gte=timezone.now() - timedelta(days=days)
+        ).values(
+            'blood_request_id', 'blood_request__patient_name', 'blood_request__blood_group',
+            'blood_request__status', 'blood_request__hospital__name'
+        ).annotate(merged_count=Count('id'), last_merged_at=Max('merged_at')).order_by('-merged_count', '-last_merged_at')
+        
+        duplicates = [{
+            'request_id': row['blood_request_id'],
+            'patient_name': row['blood_request__patient_name'],
+            'blood_group': row['blood_request__blood_group'],
+            'status': row['blood_request__status'],
+            'hospital_name': row['blood_request__hospital__name'],
+            'merged_count': row['merged_count'],
+            'last_merged_at': row['last_merged_at'],
+        } for row in rows]
+        
+        return Response({
+            'count': len(duplicates),
+            'total_merged': sum(row['merged_count'] for row in duplicates),
+            'duplicates': duplicates
+        })
+    except Exception as e:
+        logger.error(f"Duplicate request report error: {str(e)}")
+        return Response({'error': 'Failed to fetch duplicate requests'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+def encode_sync_cursor(timestamp):
+    """
+    Opaque delta-sync cursor: the newest change the client has seen plus
+    the date it was issued on (eligibility is date dependent)
+    """
+    raw = f"{timestamp.isoformat()}|{date.today().isoformat()}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_sync_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        timestamp, issued_on = raw.split('|')
+        since = datetime.fromisoformat(timestamp)
+        cursor_date = date.fromisoformat(issued_on)
+    except (UnicodeError, binascii.Error) as e:
+        raise ValueError(str(e))
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since, cursor_date
+
+def notification_changes(donor, since, cursor, params):
+    """
+    Notifications that changed after ``since``, split into upserts the
+    donor should show and tombstones for ones that expired, were declined
+    or whose request is no longer open.
+    
+    ``updated_at`` is stamped before the row commits, so a change can land
+    with a timestamp older than a cursor already handed out. Each delta
+    therefore reaches back SYNC_CURSOR_LAG_SECONDS before ``since``; rows
+    may repeat across deltas and clients apply them by id.
+    """
+    since = since - timedelta(seconds=getattr(settings, 'SYNC_CURSOR_LAG_SECONDS', 60))
+    changed = DonorNotificationSerializer.narrow(
+        DonorNotification.objects.filter(donor=donor).filter(
+            Q(updated_at__gt=since) | Q(blood_request__updated_at__gt=since)
+        ).select_related('blood_request', 'blood_request__hospital', 'donor', 'donor__user'),
+        'status', 'blood_request__status',
+        **params
+    )
+    
+    can_donate, _ = donor.can_donate()
+    upserts = []
+    removed = []
+    for notification in changed:
+        if can_donate and notification.status == 'pending' and notification.blood_request.status == 'approved':
+            upserts.append(notification)
+        else:
+            removed.append({
+                'id': notification.id,
+                'status': notification.status,
+                'request_status': notification.blood_request.status
+            })
+    
+    return {
+        'count': len(upserts),
+        'notifications': DonorNotificationSerializer(upserts, many=True, **params).data,
+        'removed': removed,
+        'reset': False,
+        'cursor': cursor
+    }
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def donor_notifications(request):
@@ -304,12 +602,53 @@ def donor_notifications(request):
         from donors.models import Donor
         donor = Donor.objects.get(user=request.user)
         
+        # Notification status, request status and donor eligibility all feed
+        # the payload, so all of them feed the ETag
+        state = DonorNotification.objects.filter(donor=donor).aggregate(
+            latest=Max('updated_at'),
+            request_latest=Max('blood_request__updated_at'),
+            count=Count('id')
+        )
+        etag = compute_etag(
+            'donor_notifications', donor.id, donor.updated_at, date.today(),
+            state['latest'], state['request_latest'], state['count']
+        )
+        cached_response = not_modified(request, etag)
+        if cached_response:
+            return cached_response
+        
+        # Delta-sync mode: ?since=<cursor> returns only what changed
+        since = None
+        if request.GET.get('since'):
+            try:
+                since, cursor_date = decode_sync_cursor(request.GET['since'])
+            except ValueError:
+                return Response({'error': 'Invalid sync cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Eligibility may have changed with the donor profile or the date,
+            # in which case the client has to rebuild its copy
+            if donor.updated_at > since or cursor_date != date.today():
+                since = None
+        
+        timestamps = [ts for ts in (state['latest'], state['request_latest'], donor.updated_at) if ts]
+        cursor = encode_sync_cursor(max(timestamps))
+        
+        params = sparse_params(request)
+        
+        if since is not None:
+            return with_etag(Response(
+                notification_changes(donor, since, cursor, params)
+            ), etag)
+        
         # ✅ ONLY show notifications for APPROVED requests where donor was eligible
-        notifications = DonorNotification.objects.filter(
-            donor=donor, 
-            status='pending',
-            blood_request__status='approved'
-        ).select_related('blood_request', 'blood_request__hospital')
+        notifications = DonorNotificationSerializer.narrow(
+            DonorNotification.objects.filter(
+                donor=donor, 
+                status='pending',
+                blood_request__status='approved'
+            ).select_related('blood_request', 'blood_request__hospital', 'donor', 'donor__user'),
+            **params
+        )
         
         # Double-check current eligibility (in case it changed after notification was sent)
         current_eligible_notifications = []
@@ -318,11 +657,14 @@ def donor_notifications(request):
             if can_donate:
                 current_eligible_notifications.append(notification)
         
-        serializer = DonorNotificationSerializer(current_eligible_notifications, many=True)
-        return Response({
+        serializer = DonorNotificationSerializer(current_eligible_notifications, many=True, **params)
+        return with_etag(Response({
             'count': len(current_eligible_notifications),
-            'notifications': serializer.data
-        })
+            'notifications': serializer.data,
+            'removed': [],
+            'reset': True,
+            'cursor': cursor
+        }), etag)
     except Donor.DoesNotExist:
         return Response({'error': 'Donor profile not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
@@ -365,4 +707,71 @@ def test_email(request):
         
     except Exception as e:
         logger.error(f"Test email error: {str(e)}")
-        return Response({'error': 'Test failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': 'Test failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def resolve_stream_channels(request):
+    """
+    Authenticate an event-stream request and return the channels it may
+    listen on. EventSource can't send headers, so the access token may
+    also come as ``?token=``.
+    """
+    auth = CachedJWTAuthentication()
+    raw_token = request.GET.get('token')
+    if raw_token:
+        user = auth.get_user(auth.get_validated_token(raw_token))
+    else:
+        result = auth.authenticate(request)
+        if result is None:
+            return None, []
+        user = result[0]
+    
+    if user.user_type == 'blood_bank_manager':
+        return user, [MANAGERS_CHANNEL]
+    if user.user_type == 'donor':
+        from donors.models import Donor
+        donor_id = Donor.objects.filter(user=user).values_list('id', flat=True).first()
+        if donor_id:
+            return user, [donor_channel(donor_id)]
+    return user, []
+
+async def event_stream(request):
+    """
+    Server-sent events: new notifications for donors, new pending requests
+    for blood bank managers. Requires an ASGI server.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Event stream requires an ASGI server'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    
+    try:
+        user, channels = await sync_to_async(resolve_stream_channels)(request)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return JsonResponse({'error': 'Invalid token'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    if user is None:
+        return JsonResponse({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+    if not channels:
+        return JsonResponse({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT_SECONDS', 25)
+    
+    async def stream():
+        subscription = get_backend().subscribe(channels)
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(heartbeat)
+                if event is None:
+                    # Comment line keeps proxies from closing idle streams
+                    yield ': keep-alive\n\n'
+                    continue
+                data = json.dumps(event, cls=DjangoJSONEncoder)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+    
+    logger.info(f"Event stream opened for user {user.id} on {', '.join(channels)}")
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response